@@ -6,6 +6,7 @@ from typing import Optional
 from bot.database.connection import DatabaseManager
 from bot.database.migrations import run_migrations
 from bot.commands.marketplace import MarketplaceCommands
+from bot.services.marketplace import MarketplaceService
 from bot.services.scheduler import ExpiryScheduler
 from config.settings import COMMAND_PREFIX, INTENTS
 
@@ -36,6 +37,9 @@ class MandokBot(commands.Bot):
         from bot.services.ordering import OrderingService
         self.ordering_service = OrderingService(self)
 
+        # Shared marketplace service used by the schedulers and cogs
+        self.marketplace_service = MarketplaceService(self)
+
         # Run database migrations
         await run_migrations(self.db_manager)
 
@@ -45,6 +49,8 @@ class MandokBot(commands.Bot):
         # Initialize scheduler service
         from bot.services.scheduler import SchedulerService
         self.scheduler_service = SchedulerService(self)
+        self.db_manager.on_listing_created = self.scheduler_service.schedule_listing_deadlines
+        self.db_manager.on_event_scheduled = self.scheduler_service.schedule_deadline
         await self.scheduler_service.start()
 
         # Add command cogs
@@ -82,6 +82,8 @@ class MarketplaceCommands(commands.Cog):
             channel_names = ["sky", "sea", "dynamis", "limbus", "others"]
 
             created_channels = []
+            # All channel embeds from one setup run share a timestamp
+            setup_time = datetime.now(timezone.utc)
 
             # Get current guild categories and channels
             guild_categories = {category.name: category for category in guild.categories}
@@ -165,7 +167,7 @@ class MarketplaceCommands(commands.Cog):
                     try:
                         # Extract proper listing type from category name
                         listing_type = "WTS" if "WTS" in category_name else "WTB"
-                        await self.setup_channel_embed(channel, listing_type, channel_name)
+                        await self.setup_channel_embed(channel, listing_type, channel_name, setup_time)
                         created_channels.append(channel)
                         logger.info(f"Set up embed for channel: {name_with_emoji}")
                     except Exception as e:
@@ -272,6 +274,7 @@ class MarketplaceCommands(commands.Cog):
                 "DELETE FROM marketplace_channels WHERE guild_id = $1",
                 guild.id
             )
+            self.bot.db_manager.invalidate_marketplace_channel_cache()
             logger.info(f"Cleared all existing marketplace channel data for guild {guild.id}")
 
             # Get all stored channels for this guild (should be empty now)
@@ -302,7 +305,8 @@ class MarketplaceCommands(commands.Cog):
         except Exception as e:
             logger.error(f"Error cleaning up invalid channels for guild {guild.id}: {e}")
 
-    async def setup_channel_embed(self, channel: discord.TextChannel, listing_type: str, zone: str):
+    async def setup_channel_embed(self, channel: discord.TextChannel, listing_type: str, zone: str,
+                                  now: Optional[datetime] = None):
         """Set up persistent embed and buttons for a marketplace channel."""
         try:
             # Get existing listings for this zone and type
@@ -311,7 +315,7 @@ class MarketplaceCommands(commands.Cog):
             )
 
             # Create embed for the channel with existing listings
-            embed = self.embeds.create_marketplace_embed(listing_type, zone, existing_listings, 0)
+            embed = self.embeds.create_marketplace_embed(listing_type, zone, existing_listings, 0, now)
 
             # Create view with appropriate buttons
             view = MarketplaceView(self.bot, listing_type, zone, 0)
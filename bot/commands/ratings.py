@@ -5,6 +5,7 @@ from discord import app_commands
 import logging
 from typing import Optional
 
+from bot.ui.embeds import MarketplaceEmbeds
 from bot.utils.permissions import is_admin
 
 logger = logging.getLogger(__name__)
@@ -106,7 +107,7 @@ class RatingCommands(commands.Cog):
             embed.set_thumbnail(url=user.avatar.url if user.avatar else user.default_avatar.url)
 
             # Rating summary
-            stars = "⭐" * int(avg_rating) + "☆" * (5 - int(avg_rating))
+            stars = MarketplaceEmbeds.star_bar(avg_rating)
             embed.add_field(
                 name="⭐ Average Rating",
                 value=f"{avg_rating:.1f}/5 {stars}",
@@ -127,13 +128,14 @@ class RatingCommands(commands.Cog):
 
             # Recent ratings
             if recent_ratings:
-                recent_text = ""
+                recent_lines = []
                 for rating in recent_ratings:
-                    rating_stars = "⭐" * rating['rating']
-                    recent_text += f"{rating_stars} ({rating['rating']}/5)\n"
+                    rating_stars = MarketplaceEmbeds.star_run(rating['rating'])
+                    recent_lines.append(f"{rating_stars} ({rating['rating']}/5)\n")
                     if rating['comment']:
-                        recent_text += f"💬 *{rating['comment'][:50]}{'...' if len(rating['comment']) > 50 else ''}*\n"
-                    recent_text += "\n"
+                        recent_lines.append(f"💬 *{rating['comment'][:50]}{'...' if len(rating['comment']) > 50 else ''}*\n")
+                    recent_lines.append("\n")
+                recent_text = "".join(recent_lines)
 
                 if recent_text:
                     embed.add_field(
@@ -190,7 +192,7 @@ class RatingCommands(commands.Cog):
                 color=0xFFD700
             )
 
-            leaderboard_text = ""
+            leaderboard_lines = []
             for i, user_data in enumerate(top_users, 1):
                 user_id = user_data['user_id']
                 avg_rating = float(user_data['reputation_avg'])
@@ -199,8 +201,9 @@ class RatingCommands(commands.Cog):
                 # Get medal emoji
                 medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
                 
-                stars = "⭐" * int(avg_rating)
-                leaderboard_text += f"{medal} <@{user_id}> - {avg_rating:.1f}/5 {stars} ({rating_count} ratings)\n"
+                stars = MarketplaceEmbeds.star_run(avg_rating)
+                leaderboard_lines.append(f"{medal} <@{user_id}> - {avg_rating:.1f}/5 {stars} ({rating_count} ratings)\n")
+            leaderboard_text = "".join(leaderboard_lines)
 
             embed.add_field(
                 name="Rankings",
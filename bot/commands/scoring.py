@@ -8,9 +8,8 @@ from discord.ext import commands
 import logging
 from typing import Dict, Any
 
-from bot.ui.embeds import MarketplaceEmbeds
+from bot.ui.embeds import MarketplaceEmbeds, format_relative_time
 from bot.services.reputation import ReputationService
-from bot.services.marketplace import MarketplaceService
 from bot.services.ordering import OrderingService
 
 logger = logging.getLogger(__name__)
@@ -18,11 +17,13 @@ logger = logging.getLogger(__name__)
 class ScoringCommands(commands.Cog):
     """Commands for scoring and statistics."""
     
+    # Embed colour resolved once at import instead of per command
+    EMBED_COLOR = MarketplaceEmbeds.COLORS['primary']
+    
     def __init__(self, bot):
         self.bot = bot
-        self.embeds = MarketplaceEmbeds()
         self.reputation_service = ReputationService(bot)
-        self.marketplace_service = MarketplaceService(bot)
+        self.marketplace_service = bot.marketplace_service
         self.ordering_service = OrderingService(bot)
     
     @discord.app_commands.command(name="profile", description="View your trading profile and scores")
@@ -44,7 +45,7 @@ class ScoringCommands(commands.Cog):
             }
             
             # Calculate comprehensive trader score
-            trader_scores = self.reputation_service.calculate_trader_score(user_stats, transaction_stats)
+            trader_scores = await self.reputation_service.calculate_trader_score(user_stats, transaction_stats)
             
             # Get recent order history
             order_history = await self.ordering_service.get_user_order_history(
@@ -67,7 +68,7 @@ class ScoringCommands(commands.Cog):
         """Create comprehensive profile embed."""
         embed = discord.Embed(
             title=f"📊 Trading Profile - {user.display_name}",
-            color=self.embeds.COLORS['primary'],
+            color=self.EMBED_COLOR,
             timestamp=discord.utils.utcnow()
         )
         
@@ -95,7 +96,7 @@ class ScoringCommands(commands.Cog):
         # Reputation breakdown
         rep_avg = user_stats.get('reputation_avg', 0.0)
         rep_count = user_stats.get('reputation_count', 0)
-        stars = "⭐" * int(rep_avg) + "☆" * (5 - int(rep_avg))
+        stars = MarketplaceEmbeds.star_bar(rep_avg)
         
         embed.add_field(
             name="⭐ Reputation",
@@ -155,7 +156,7 @@ class ScoringCommands(commands.Cog):
                     'cancelled': '❌'
                 }.get(order['status'], '❓')
                 
-                history_text += f"{status_emoji} {order['item']} • <t:{int(order['created_at'].timestamp())}:R>\n"
+                history_text += f"{status_emoji} {order['item']} • {format_relative_time(order['created_at'])}\n"
             
             embed.add_field(
                 name="📋 Recent Orders",
@@ -180,7 +181,7 @@ class ScoringCommands(commands.Cog):
             embed = discord.Embed(
                 title="🏆 Trading Leaderboard",
                 description="Top traders by reputation and activity",
-                color=self.embeds.COLORS['primary'],
+                color=self.EMBED_COLOR,
                 timestamp=discord.utils.utcnow()
             )
             
@@ -200,7 +201,7 @@ class ScoringCommands(commands.Cog):
                     # Medal emojis for top 3
                     medal = {1: "🥇", 2: "🥈", 3: "🥉"}.get(i, f"{i}.")
                     
-                    stars = "⭐" * int(entry['reputation_avg'])
+                    stars = MarketplaceEmbeds.star_run(entry['reputation_avg'])
                     reliability = entry.get('reliability_score', 0)
                     
                     leaderboard_text += (
@@ -236,7 +237,7 @@ class ScoringCommands(commands.Cog):
             
             embed = discord.Embed(
                 title="📋 Your Order History",
-                color=self.embeds.COLORS['primary'],
+                color=self.EMBED_COLOR,
                 timestamp=discord.utils.utcnow()
             )
             
@@ -274,7 +275,7 @@ class ScoringCommands(commands.Cog):
                         
                         orders_text += (
                             f"**#{order['id']}** {order_type} {other_party}\n"
-                            f"📦 {order['item']} • <t:{int(order['created_at'].timestamp())}:R>\n\n"
+                            f"📦 {order['item']} • {format_relative_time(order['created_at'])}\n\n"
                         )
                     
                     if orders_text:
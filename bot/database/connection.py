@@ -4,28 +4,62 @@ Database connection and management utilities.
 
 import asyncio
 import logging
+import time
 import asyncpg
-from typing import Optional, List, Dict, Any
-from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any, Callable, Tuple
+from datetime import datetime, timezone, timedelta
 
-from config.settings import DATABASE_URL
+from config.settings import (
+    DATABASE_URL,
+    DATABASE_POOL_MIN_SIZE,
+    DATABASE_POOL_MAX_SIZE,
+    DATABASE_COMMAND_TIMEOUT,
+    DATABASE_STATEMENT_CACHE_SIZE,
+)
 
 logger = logging.getLogger(__name__)
 
 class DatabaseManager:
     """Manages PostgreSQL database connections and operations."""
 
+    # Scheduler tick queries, kept as constants so every call reuses the
+    # same prepared statement from the per-connection statement cache
+    PENDING_EVENT_PROBE_SQL = (
+        "SELECT 1 FROM scheduled_events WHERE status = 'pending' AND event_time <= $1 LIMIT 1"
+    )
+    CLAIM_PENDING_EVENTS_SQL = """
+        SELECT se.id, se.listing_id, l.user_id, l.item, l.zone, l.guild_id, l.listing_type
+        FROM scheduled_events se
+        JOIN listings l ON se.listing_id = l.id
+        WHERE se.status = 'pending' 
+          AND se.event_time <= $1
+          AND l.active = TRUE
+        FOR UPDATE OF se SKIP LOCKED
+    """
+
+    # Seconds a cached (guild, listing type, zone) -> marketplace channel row stays valid
+    MARKETPLACE_CHANNEL_CACHE_TTL = 300
+
     def __init__(self):
         self.pool: Optional[asyncpg.Pool] = None
+        # (guild_id, listing_type, zone) -> (channel row, expiry on the monotonic clock)
+        self._marketplace_channel_cache: Dict[Tuple[int, str, str], Tuple[Dict[str, Any], float]] = {}
+        # Called with each new listing's expires_at so the scheduler can wake for it
+        self.on_listing_created: Optional[Callable[[datetime], None]] = None
+        # Called with each new scheduled event's time so the scheduler can wake for it
+        self.on_event_scheduled: Optional[Callable[[datetime], None]] = None
 
     async def initialize(self):
         """Initialize the database connection pool."""
         try:
             self.pool = await asyncpg.create_pool(
                 DATABASE_URL,
-                min_size=1,
-                max_size=10,
-                command_timeout=60
+                min_size=DATABASE_POOL_MIN_SIZE,
+                max_size=DATABASE_POOL_MAX_SIZE,
+                command_timeout=DATABASE_COMMAND_TIMEOUT,
+                # asyncpg prepares each distinct query text once per connection
+                # and reuses the statement while it stays in this LRU cache
+                statement_cache_size=DATABASE_STATEMENT_CACHE_SIZE
             )
             logger.info("Database connection pool initialized")
         except Exception as e:
@@ -64,6 +98,29 @@ class DatabaseManager:
                 logger.error(f"Params: {params}")
                 raise
 
+    async def fetchrow(self, query: str, *params) -> Optional[Dict[str, Any]]:
+        """Execute a query and return only the first row, or None."""
+        async with self.pool.acquire() as connection:
+            try:
+                row = await connection.fetchrow(query, *params)
+                return dict(row) if row is not None else None
+            except Exception as e:
+                logger.error(f"Database query error: {e}")
+                logger.error(f"Query: {query}")
+                logger.error(f"Params: {params}")
+                raise
+
+    async def fetchval(self, query: str, *params) -> Any:
+        """Execute a query and return the first column of the first row."""
+        async with self.pool.acquire() as connection:
+            try:
+                return await connection.fetchval(query, *params)
+            except Exception as e:
+                logger.error(f"Database query error: {e}")
+                logger.error(f"Query: {query}")
+                logger.error(f"Params: {params}")
+                raise
+
     async def execute_command(self, command: str, *args) -> str:
         """Execute a command and return status."""
         if not self.pool:
@@ -136,6 +193,7 @@ class DatabaseManager:
                 DO UPDATE SET listing_type = $3, zone = $4
             """
             await self.execute_command(command, guild_id, channel.id, listing_type, zone)
+            self.invalidate_marketplace_channel_cache()
 
         except Exception as e:
             logger.error(f"Error storing channel info: {e}")
@@ -162,6 +220,8 @@ class DatabaseManager:
                 """
                 await self.execute_command(insert_command, guild_id, channel_id, message_id, listing_type, zone)
 
+            self.invalidate_marketplace_channel_cache()
+
         except Exception as e:
             logger.error(f"Error storing marketplace message: {e}")
             raise
@@ -195,6 +255,7 @@ class DatabaseManager:
             """
 
             result = await self.execute_command(command, *channel_ids)
+            self.invalidate_marketplace_channel_cache()
             logger.info(f"Cleaned up {len(channel_ids)} invalid channel entries: {result}")
 
         except Exception as e:
@@ -209,12 +270,51 @@ class DatabaseManager:
                 "DELETE FROM marketplace_channels WHERE channel_id = $1",
                 channel_id
             )
+            self.invalidate_marketplace_channel_cache()
 
             logger.info(f"Cleaned up data for channel {channel_id}")
 
         except Exception as e:
             logger.error(f"Error cleaning up channel data: {e}")
 
+    async def get_marketplace_channel(self, guild_id: int, listing_type: str, zone: str) -> Optional[Dict[str, Any]]:
+        """Get the marketplace channel and message for a listing type and zone, cached for a few minutes."""
+        cache_key = (guild_id, listing_type, zone)
+        cached = self._marketplace_channel_cache.get(cache_key)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+
+        try:
+            result = await self.execute_query(
+                "SELECT channel_id, message_id FROM marketplace_channels WHERE guild_id = $1 AND listing_type = $2 AND zone = $3",
+                guild_id, listing_type, zone
+            )
+            if not result:
+                return None
+
+            # Only found rows are cached so a freshly set up channel is picked up right away
+            channel_data = result[0]
+            self._marketplace_channel_cache[cache_key] = (
+                channel_data, time.monotonic() + self.MARKETPLACE_CHANNEL_CACHE_TTL
+            )
+            return channel_data
+
+        except Exception as e:
+            logger.error(f"Error getting marketplace channel: {e}")
+            return None
+
+    async def update_marketplace_message_id(self, channel_id: int, message_id: int):
+        """Point a marketplace channel at a relocated marketplace message."""
+        await self.execute_command(
+            "UPDATE marketplace_channels SET message_id = $1 WHERE channel_id = $2",
+            message_id, channel_id
+        )
+        self.invalidate_marketplace_channel_cache()
+
+    def invalidate_marketplace_channel_cache(self):
+        """Drop cached marketplace channel lookups after the channel configuration changes."""
+        self._marketplace_channel_cache.clear()
+
     async def verify_channel_exists(self, guild_id: int, channel_id: int) -> bool:
         """Verify if a channel exists in the database."""
         try:
@@ -233,10 +333,14 @@ class DatabaseManager:
                            scheduled_time: datetime) -> Optional[int]:
         """Create a new marketplace listing."""
         try:
-            # Ensure user exists in users table first
-            await self.ensure_user_exists(user_id)
-
+            # Ensure the user row exists in the same statement as the insert,
+            # saving a round trip; the FK check runs after both rows are written
             command = """
+                WITH ensure_user AS (
+                    INSERT INTO users (user_id, created_at, updated_at)
+                    VALUES ($1, $10, $10)
+                    ON CONFLICT (user_id) DO NOTHING
+                )
                 INSERT INTO listings (
                     user_id, guild_id, listing_type, zone, subcategory, 
                     item, quantity, notes, scheduled_time, created_at, expires_at
@@ -246,7 +350,6 @@ class DatabaseManager:
             """
 
             created_at = datetime.now(timezone.utc)
-            from datetime import timedelta
             expires_at = created_at + timedelta(days=14)  # 14 days expiry
 
             result = await self.execute_query(
@@ -257,6 +360,8 @@ class DatabaseManager:
             if result:
                 listing_id = result[0]['id']
                 logger.info(f"Created listing {listing_id} for user {user_id}")
+                if self.on_listing_created:
+                    self.on_listing_created(expires_at)
                 return listing_id
 
         except Exception as e:
@@ -266,10 +371,11 @@ class DatabaseManager:
         return None
 
     async def get_zone_listings(self, guild_id: int, listing_type: str, zone: str) -> List[Dict[str, Any]]:
-        """Get all active listings for a specific zone and type."""
+        """Get all active listings for a specific zone and type, shaped for the marketplace embed."""
         try:
             query = """
-                SELECT l.*, u.username, u.reputation_avg
+                SELECT l.id, l.user_id, l.subcategory, l.item,
+                       l.quantity, l.notes, l.scheduled_time, u.reputation_avg
                 FROM listings l
                 LEFT JOIN users u ON l.user_id = u.user_id
                 WHERE l.guild_id = $1 
@@ -281,50 +387,13 @@ class DatabaseManager:
             """
 
             current_time = datetime.now(timezone.utc)
-            results = await self.execute_query(query, guild_id, listing_type, zone, current_time)
-
-            # Additional validation to ensure no cross-contamination
-            filtered_results = []
-            for listing in results:
-                if listing['listing_type'] == listing_type and listing['zone'] == zone:
-                    filtered_results.append(listing)
-                else:
-                    logger.warning(f"Filtered out mismatched listing: {listing['id']} - expected {listing_type}/{zone}, got {listing['listing_type']}/{listing['zone']}")
-
-            return filtered_results
+            # The WHERE clause already pins listing_type and zone exactly
+            return await self.execute_query(query, guild_id, listing_type, zone, current_time)
 
         except Exception as e:
             logger.error(f"Error getting zone listings: {e}")
             return []
 
-    async def get_listing_queues(self, listing_id: int) -> Dict[str, List[int]]:
-        """Get queued items and buyers for a specific listing (for WTS All Items)."""
-        try:
-            queue_data = await self.execute_query(
-                """
-                SELECT q.user_id, q.requested_item
-                FROM queues q
-                WHERE q.listing_id = $1 AND q.queue_type = 'buyer_queue'
-                ORDER BY q.created_at ASC
-                """,
-                listing_id
-            )
-
-            # Group by requested item
-            queued_items = {}
-            for queue_entry in queue_data or []:
-                item = queue_entry['requested_item']
-                user_id = queue_entry['user_id']
-
-                if item not in queued_items:
-                    queued_items[item] = []
-                queued_items[item].append(user_id)
-
-            return queued_items
-        except Exception as e:
-            logger.error(f"Error getting listing queues: {e}")
-            return {}
-
     async def add_to_queue(self, listing_id: int, user_id: int, item_name: str) -> bool:
         """Add a user to the queue for a specific item."""
         try:
@@ -430,21 +499,8 @@ class DatabaseManager:
             logger.error(f"Error getting expired listings: {e}")
             return []
 
-    async def mark_listing_reminded(self, listing_id: int):
-        """Mark a listing as reminded about expiry."""
-        try:
-            command = """
-                UPDATE listings 
-                SET reminded = TRUE
-                WHERE id = $1
-            """
-            await self.execute_command(command, listing_id)
-
-        except Exception as e:
-            logger.error(f"Error marking listing as reminded: {e}")
-
-    async def add_reputation(self, rater_id: int, target_id: int, listing_id: int, rating: int, comment: str) -> bool:
-        """Add a reputation rating."""
+    async def add_reputation(self, rater_id: int, target_id: int, listing_id: int, rating: int, comment: str) -> Optional[Dict[str, Any]]:
+        """Add a reputation rating and return the target's updated reputation data."""
         try:
             # Check if already rated
             existing = await self.execute_query(
@@ -453,7 +509,7 @@ class DatabaseManager:
             )
 
             if existing:
-                return False  # Already rated
+                return None  # Already rated
 
             # Add reputation
             command = """
@@ -467,16 +523,16 @@ class DatabaseManager:
             )
 
             # Update user reputation stats
-            await self.update_user_reputation(target_id)
+            user_data = await self.update_user_reputation(target_id)
 
-            return True
+            return user_data or await self.get_user_reputation(target_id)
 
         except Exception as e:
             logger.error(f"Error adding reputation: {e}")
-            return False
+            return None
 
-    async def update_user_reputation(self, user_id: int):
-        """Update user's reputation statistics."""
+    async def update_user_reputation(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Update user's reputation statistics and return the stored values."""
         try:
             # Calculate new averages
             stats = await self.execute_query("""
@@ -500,16 +556,21 @@ class DatabaseManager:
                         reputation_avg = $2, 
                         reputation_count = $3, 
                         updated_at = $4
+                    RETURNING reputation_avg, reputation_count, activity_score
                 """
 
-                await self.execute_command(
+                result = await self.execute_query(
                     command, user_id, avg_rating, total_ratings, 
                     datetime.now(timezone.utc)
                 )
 
+                return result[0] if result else None
+
         except Exception as e:
             logger.error(f"Error updating user reputation: {e}")
 
+        return None
+
     async def get_user_reputation(self, user_id: int) -> Dict[str, Any]:
         """Get user's reputation data."""
         try:
@@ -522,10 +583,10 @@ class DatabaseManager:
                 WHERE user_id = $1
             """
 
-            result = await self.execute_query(query, user_id)
+            result = await self.fetchrow(query, user_id)
 
             if result:
-                return result[0]
+                return result
             else:
                 return {
                     'reputation_avg': 0.0,
@@ -582,6 +643,31 @@ class DatabaseManager:
             logger.error(f"Error getting listing queues: {e}")
             return {}
 
+    async def get_listings_queues(self, listing_ids: List[int]) -> Dict[int, Dict[str, List[int]]]:
+        """Get queued items and buyers for several listings in one query, keyed by listing id."""
+        try:
+            if not listing_ids:
+                return {}
+
+            results = await self.execute_query(
+                """
+                SELECT listing_id, item_name, user_id
+                FROM listing_queues
+                WHERE listing_id = ANY($1::int[])
+                ORDER BY listing_id, item_name, created_at ASC
+                """,
+                listing_ids
+            )
+
+            queues = {}
+            for row in results:
+                queues.setdefault(row['listing_id'], {}).setdefault(row['item_name'], []).append(row['user_id'])
+
+            return queues
+        except Exception as e:
+            logger.error(f"Error getting queues for listings: {e}")
+            return {}
+
     async def remove_from_queue_by_item(self, user_id: int, listing_id: int, item_name: str) -> bool:
         """Remove a user from queue for a specific item."""
         try:
@@ -703,6 +789,7 @@ class DatabaseManager:
                 "DELETE FROM marketplace_channels WHERE guild_id = $1", 
                 guild_id
             )
+            self.invalidate_marketplace_channel_cache()
             logger.info(f"Cleaned up data for guild {guild_id}")
         except Exception as e:
             logger.error(f"Error cleaning up guild data: {e}")
@@ -759,24 +846,38 @@ class DatabaseManager:
                 """,
                 listing_id, event_time, datetime.now(timezone.utc)
             )
+            if self.on_event_scheduled:
+                self.on_event_scheduled(event_time)
             return True
         except Exception as e:
             logger.error(f"Error creating scheduled event: {e}")
             return False
 
-    async def get_pending_events(self) -> List[Dict[str, Any]]:
-        """Get all pending scheduled events that should trigger."""
-        try:
-            current_time = datetime.now(timezone.utc)
-            query = """
-                SELECT se.*, l.user_id, l.item, l.zone, l.guild_id
-                FROM scheduled_events se
-                JOIN listings l ON se.listing_id = l.id
-                WHERE se.status = 'pending' 
-                  AND se.event_time <= $1
-                  AND l.active = TRUE
-            """
-            return await self.execute_query(query, current_time)
-        except Exception as e:
-            logger.error(f"Error getting pending events: {e}")
-            return []
\ No newline at end of file
+    async def claim_pending_events(self) -> List[Dict[str, Any]]:
+        """Fetch due events, mark them started and deactivate their listings in one transaction."""
+        if not self.pool:
+            raise RuntimeError("Database pool not initialized")
+
+        current_time = datetime.now(timezone.utc)
+        async with self.pool.acquire() as connection:
+            # Cheap partial-index probe so idle ticks skip opening a transaction
+            has_due = await connection.fetchval(self.PENDING_EVENT_PROBE_SQL, current_time)
+            if not has_due:
+                return []
+
+            async with connection.transaction():
+                rows = await connection.fetch(self.CLAIM_PENDING_EVENTS_SQL, current_time)
+                events = [dict(row) for row in rows]
+
+                if events:
+                    # One array-keyed UPDATE per table instead of one per event
+                    await connection.execute(
+                        "UPDATE scheduled_events SET status = 'started' WHERE id = ANY($1::int[])",
+                        [event['id'] for event in events]
+                    )
+                    await connection.execute(
+                        "UPDATE listings SET active = FALSE WHERE id = ANY($1::int[])",
+                        list({event['listing_id'] for event in events})
+                    )
+
+        return events
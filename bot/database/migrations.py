@@ -84,6 +84,12 @@ class MigrationManager:
             10: self.add_event_confirmations_table,
             11: self.add_event_ratings_table,
             12: self.add_guild_rating_configs_table,
+            13: self.add_reputation_archive_columns,
+            14: self.add_reputation_recent_index,
+            15: self.add_user_rating_histogram_table,
+            16: self.add_scheduler_indexes,
+            17: self.drop_superseded_scheduled_event_indexes,
+            18: self.add_rating_prompt_columns,
         }
 
     async def migration_001_initial_schema(self):
@@ -291,6 +297,126 @@ class MigrationManager:
         
         logger.info("Guild rating configs table created successfully")
 
+    async def add_reputation_archive_columns(self):
+        """Add soft-archive columns to the reputation table."""
+        commands = [
+            "ALTER TABLE reputation ADD COLUMN IF NOT EXISTS archived_reason TEXT",
+            "ALTER TABLE reputation ADD COLUMN IF NOT EXISTS archived_at TIMESTAMP WITH TIME ZONE",
+        ]
+        for command in commands:
+            await self.db_manager.execute_command(command)
+
+        logger.info("Reputation archive columns added successfully")
+
+    async def add_reputation_recent_index(self):
+        """Add covering index for a user's most recent ratings."""
+        await self.db_manager.execute_command("""
+            CREATE INDEX IF NOT EXISTS idx_reputation_target_created
+            ON reputation(target_id, created_at DESC) INCLUDE (rating, comment, rater_id)
+        """)
+
+        logger.info("Reputation recent ratings index created successfully")
+
+    async def add_user_rating_histogram_table(self):
+        """Add trigger-maintained per-user rating histogram."""
+        await self.db_manager.execute_command("""
+            CREATE TABLE IF NOT EXISTS user_rating_histogram (
+                user_id BIGINT NOT NULL,
+                rating SMALLINT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (user_id, rating)
+            )
+        """)
+
+        await self.db_manager.execute_command("""
+            CREATE OR REPLACE FUNCTION update_user_rating_histogram() RETURNS TRIGGER AS $$
+            BEGIN
+                -- An update moves the row from its OLD bucket to its NEW one
+                IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                    IF OLD.rating IS NOT NULL THEN
+                        UPDATE user_rating_histogram
+                        SET count = count - 1
+                        WHERE user_id = OLD.target_id AND rating = OLD.rating;
+                    END IF;
+                END IF;
+                IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                    IF NEW.rating IS NOT NULL THEN
+                        INSERT INTO user_rating_histogram (user_id, rating, count)
+                        VALUES (NEW.target_id, NEW.rating, 1)
+                        ON CONFLICT (user_id, rating)
+                        DO UPDATE SET count = user_rating_histogram.count + 1;
+                    END IF;
+                    RETURN NEW;
+                END IF;
+                RETURN OLD;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+
+        await self.db_manager.execute_command(
+            "DROP TRIGGER IF EXISTS trg_reputation_histogram ON reputation"
+        )
+
+        await self.db_manager.execute_command("""
+            CREATE TRIGGER trg_reputation_histogram
+            AFTER INSERT OR DELETE OR UPDATE OF rating, target_id ON reputation
+            FOR EACH ROW EXECUTE FUNCTION update_user_rating_histogram()
+        """)
+
+        # Backfill from existing ratings
+        await self.db_manager.execute_command("""
+            INSERT INTO user_rating_histogram (user_id, rating, count)
+            SELECT target_id, rating, COUNT(*)
+            FROM reputation
+            WHERE rating IS NOT NULL
+            GROUP BY target_id, rating
+            ON CONFLICT (user_id, rating) DO UPDATE SET count = EXCLUDED.count
+        """)
+
+        logger.info("User rating histogram table and trigger created successfully")
+
+    async def add_scheduler_indexes(self):
+        """Add partial indexes for the scheduler's reminder and event queries."""
+        # Expiry lookups are already covered by idx_listings_expires (migration 002)
+        await self.db_manager.execute_command("""
+            CREATE INDEX IF NOT EXISTS idx_listings_reminder
+            ON listings(expires_at) WHERE active = TRUE AND reminded = FALSE
+        """)
+
+        await self.db_manager.execute_command("""
+            CREATE INDEX IF NOT EXISTS idx_scheduled_events_pending
+            ON scheduled_events(event_time) WHERE status = 'pending'
+        """)
+
+        logger.info("Scheduler indexes created successfully")
+
+    async def drop_superseded_scheduled_event_indexes(self):
+        """Drop scheduled_events indexes made redundant by idx_scheduled_events_pending."""
+        # Every status/event_time lookup filters on status = 'pending', which the
+        # partial index serves; the full indexes only add write overhead
+        for index_name in ("idx_scheduled_events_time", "idx_scheduled_events_status"):
+            await self.db_manager.execute_command(
+                f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}"
+            )
+
+        logger.info("Superseded scheduled event indexes dropped successfully")
+
+    async def add_rating_prompt_columns(self):
+        """Persist rating prompt times on scheduled_events so they survive restarts."""
+        commands = [
+            "ALTER TABLE scheduled_events ADD COLUMN IF NOT EXISTS rating_prompt_at TIMESTAMPTZ",
+            "ALTER TABLE scheduled_events ADD COLUMN IF NOT EXISTS rating_prompted_at TIMESTAMPTZ",
+            """
+            CREATE INDEX IF NOT EXISTS idx_scheduled_events_rating_prompt
+            ON scheduled_events(rating_prompt_at)
+            WHERE rating_prompt_at IS NOT NULL AND rating_prompted_at IS NULL
+            """,
+        ]
+        for command in commands:
+            await self.db_manager.execute_command(command)
+
+        logger.info("Rating prompt columns added successfully")
+
     async def populate_items_table(self):
         """Populate items table with initial marketplace data."""
         items_data = [
@@ -2,20 +2,29 @@
 Core marketplace business logic and services.
 """
 
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+import discord
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timezone, timedelta
 
 from bot.ui.embeds import MarketplaceEmbeds
+from bot.ui.views import MarketplaceView
 
 logger = logging.getLogger(__name__)
 
 class MarketplaceService:
     """Core service for marketplace operations."""
 
+    # Quiet period during which repeat refresh requests for a zone are collapsed
+    REFRESH_DEBOUNCE_SECONDS = 1.0
+
     def __init__(self, bot):
         self.bot = bot
         self.embeds = MarketplaceEmbeds()
+        # Zones with a refresh already scheduled, and refreshes still running
+        self._pending_refreshes: Dict[Tuple[int, str, str], asyncio.TimerHandle] = {}
+        self._refresh_tasks = set()
 
     async def refresh_marketplace_embed(self, guild_id: int, channel_id: int):
         """Refresh the marketplace embed in a specific channel."""
@@ -42,19 +51,82 @@ class MarketplaceService:
                 # Don't return here - continue with the refresh
 
             # Get active listings ONLY for this specific listing type and zone
-            listings = await self.bot.db_manager.get_zone_listings(guild_id, listing_type, zone)
-            
-            # Add queue data for all WTS listings
-            if listing_type.upper() == "WTS":
-                for listing in listings:
-                    # Get queued items for this listing
-                    queued_items = await self.bot.db_manager.get_listing_queues(listing['id'])
-                    listing['queued_items'] = queued_items  # Always add, even if empty
+            listings = await self.get_zone_listings_with_queues(guild_id, listing_type, zone)
 
             # Create updated embed with pagination (start at page 0)
             # Force the embed to use the channel's listing type and zone
             embed = self.embeds.create_marketplace_embed(listing_type, zone, listings, 0)
 
+            await self.publish_marketplace_embed(channel_id, message_id, listing_type, zone, embed)
+
+        except Exception as e:
+            logger.error(f"Error refreshing marketplace embed: {e}")
+
+    async def refresh_zone_embed(self, guild: discord.Guild, listing_type: str, zone: str):
+        """Refresh a zone's marketplace message after a listing or queue change."""
+        try:
+            # Get the marketplace channel for this listing type and zone
+            channel_data = await self.bot.db_manager.get_marketplace_channel(guild.id, listing_type, zone)
+            if not channel_data:
+                logger.warning(f"No marketplace channel found for {listing_type} in {zone}")
+                return
+
+            channel = guild.get_channel(channel_data['channel_id'])
+            if not channel:
+                logger.warning(f"Channel {channel_data['channel_id']} not found")
+                return
+
+            # Render the first page once; the same view serves whichever message gets edited
+            listings = await self.get_zone_listings_with_queues(guild.id, listing_type, zone)
+            embed = self.embeds.create_marketplace_embed(listing_type, zone, listings, 0)
+            view = MarketplaceView(self.bot, listing_type, zone, 0)
+
+            # Try the stored message first
+            message_id = channel_data['message_id']
+            if message_id:
+                try:
+                    message = await channel.fetch_message(message_id)
+                    await message.edit(embed=embed, view=view)
+                    logger.info(f"Successfully refreshed marketplace embed with {len(listings)} listings")
+                    return
+                except discord.NotFound:
+                    logger.warning(f"Marketplace message {message_id} not found, searching...")
+
+            # Otherwise search recent history for the bot's marketplace message
+            type_upper = listing_type.upper()
+            zone_lower = zone.lower()
+            async for message in channel.history(limit=50):
+                if (message.author == self.bot.user and 
+                    message.embeds and 
+                    message.embeds[0].title and 
+                    type_upper in message.embeds[0].title and
+                    zone_lower in message.embeds[0].title.lower()):
+                    await message.edit(embed=embed, view=view)
+
+                    # Update the stored message_id
+                    await self.bot.db_manager.update_marketplace_message_id(channel.id, message.id)
+                    logger.info(f"Found and updated marketplace message, stored ID: {message.id}")
+                    break
+
+        except Exception as e:
+            logger.error(f"Error refreshing marketplace embed: {e}")
+
+    async def get_zone_listings_with_queues(self, guild_id: int, listing_type: str, zone: str) -> List[Dict[str, Any]]:
+        """Get a zone's active listings, with queue data attached to WTS listings."""
+        listings = await self.bot.db_manager.get_zone_listings(guild_id, listing_type, zone)
+
+        # Add queue data for all WTS listings
+        if listing_type.upper() == "WTS":
+            queues = await self.bot.db_manager.get_listings_queues([listing['id'] for listing in listings])
+            for listing in listings:
+                listing['queues'] = queues.get(listing['id'], {})  # Always add, even if empty
+
+        return listings
+
+    async def publish_marketplace_embed(self, channel_id: int, message_id: Optional[int], listing_type: str,
+                                        zone: str, embed: discord.Embed):
+        """Put a rendered marketplace embed on a channel's stored message, or send a new one."""
+        try:
             # Get channel and message
             channel = self.bot.get_channel(channel_id)
             if not channel:
@@ -65,33 +137,24 @@ class MarketplaceService:
                 try:
                     message = await channel.fetch_message(message_id)
                     # Create new view with the channel's specific listing type and zone
-                    from bot.ui.views import MarketplaceView
                     view = MarketplaceView(self.bot, listing_type, zone, 0)
                     await message.edit(embed=embed, view=view)
                     logger.info(f"Updated {listing_type} marketplace embed for {zone} in {channel.name}")
                 except Exception as msg_error:
                     logger.warning(f"Could not update message {message_id}: {msg_error}")
-                    # Message not found, send new one
-                    await self.send_new_marketplace_embed(channel, listing_type, zone)
+                    # Message not found, send new one with the embed already rendered
+                    await self.send_new_marketplace_embed(channel, listing_type, zone, embed)
             else:
                 # No message ID stored, send new one
-                await self.send_new_marketplace_embed(channel, listing_type, zone)
+                await self.send_new_marketplace_embed(channel, listing_type, zone, embed)
 
         except Exception as e:
-            logger.error(f"Error refreshing marketplace embed: {e}")
+            logger.error(f"Error publishing marketplace embed to channel {channel_id}: {e}")
 
-    async def send_new_marketplace_embed(self, channel, listing_type: str, zone: str):
-        """Send a new marketplace embed to a channel."""
+    async def send_new_marketplace_embed(self, channel, listing_type: str, zone: str, embed: discord.Embed):
+        """Send an already rendered marketplace embed to a channel as a new message."""
         try:
-            from bot.ui.views import MarketplaceView
-
-            # Get listings for this zone
-            listings = await self.bot.db_manager.get_zone_listings(
-                channel.guild.id, listing_type, zone
-            )
-
-            # Create embed and view with pagination
-            embed = self.embeds.create_marketplace_embed(listing_type, zone, listings, 0)
+            # Create view with pagination
             view = MarketplaceView(self.bot, listing_type, zone, 0)
 
             # Send message
@@ -176,16 +239,42 @@ class MarketplaceService:
 
             # Get channel for this listing type and zone
             channels = await self.bot.db_manager.execute_query(
-                "SELECT channel_id FROM marketplace_channels WHERE guild_id = $1 AND listing_type = $2 AND zone = $3 AND zone != 'unknown'",
+                "SELECT channel_id, message_id FROM marketplace_channels WHERE guild_id = $1 AND listing_type = $2 AND zone = $3 AND zone != 'unknown'",
                 guild_id, listing_type, zone
             )
+            if not channels:
+                return
+
+            # Every channel for the zone shows the same page, so load and render it once
+            listings = await self.get_zone_listings_with_queues(guild_id, listing_type, zone)
+            embed = self.embeds.create_marketplace_embed(listing_type, zone, listings, 0)
 
             for channel_data in channels:
-                await self.refresh_marketplace_embed(guild_id, channel_data['channel_id'])
+                await self.publish_marketplace_embed(
+                    channel_data['channel_id'], channel_data['message_id'], listing_type, zone, embed
+                )
 
         except Exception as e:
             logger.error(f"Error refreshing marketplace embeds for zone: {e}")
 
+    def request_zone_refresh(self, guild_id: int, listing_type: str, zone: str):
+        """Refresh a zone's embeds after a short delay, collapsing requests made meanwhile."""
+        zone_key = (guild_id, listing_type, zone)
+        if zone_key in self._pending_refreshes:
+            return
+
+        loop = asyncio.get_running_loop()
+        self._pending_refreshes[zone_key] = loop.call_later(
+            self.REFRESH_DEBOUNCE_SECONDS, self._start_zone_refresh, zone_key
+        )
+
+    def _start_zone_refresh(self, zone_key: Tuple[int, str, str]):
+        """Launch a debounced zone refresh, keeping a reference until it finishes."""
+        self._pending_refreshes.pop(zone_key, None)
+        task = asyncio.create_task(self.refresh_marketplace_embeds_for_zone(*zone_key))
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
     async def refresh_marketplace_embed_in_current_channel(self, interaction, listing_type: str, zone: str):
         """Refresh the marketplace embed in the current channel where interaction happened."""
         try:
@@ -310,6 +399,7 @@ class MarketplaceService:
             # Combine all statistics
             stats = {
                 **user_data,
+                'user_id': user_id,
                 'total_listings': listing_stats[0]['total_listings'] if listing_stats else 0,
                 'wts_count': listing_stats[0]['wts_count'] if listing_stats else 0,
                 'wtb_count': listing_stats[0]['wtb_count'] if listing_stats else 0,
@@ -7,6 +7,8 @@ from typing import Dict, Any, Optional, List
 from datetime import datetime, timezone
 import asyncio
 
+from bot.ui.views_ordering import RatingModerationView
+
 logger = logging.getLogger(__name__)
 
 class OrderingService:
@@ -566,8 +568,6 @@ class OrderingService:
             rated = guild.get_member(rated_id)
 
             # Send moderation embed to configured admin channel
-            from bot.ui.views_ordering import RatingModerationView
-
             moderation_embed = discord.Embed(
                 title="⚠️ Rating Requires Moderation",
                 description="A low rating has been submitted and requires admin approval.",
@@ -2,6 +2,8 @@
 Reputation and rating system services.
 """
 
+import asyncio
+import json
 import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone
@@ -10,9 +12,16 @@ logger = logging.getLogger(__name__)
 
 class ReputationService:
     """Service for managing user reputation and ratings."""
+
+    # Bound on pending rating side effects before add_rating waits for the worker
+    SIDE_EFFECT_QUEUE_SIZE = 1000
+    # Window for collecting queued side effects so repeat role checks collapse into one
+    SIDE_EFFECT_DEBOUNCE_SECONDS = 1.0
     
     def __init__(self, bot):
         self.bot = bot
+        self._bg_queue: asyncio.Queue = asyncio.Queue(maxsize=self.SIDE_EFFECT_QUEUE_SIZE)
+        self._bg_worker: Optional[asyncio.Task] = None
     
     async def add_rating(self, rater_id: int, target_id: int, listing_id: int, rating: int, comment: str = "") -> bool:
         """Add a rating for a user."""
@@ -25,17 +34,14 @@ class ReputationService:
             if rater_id == target_id:
                 raise ValueError("Cannot rate yourself")
             
-            # Add rating
-            success = await self.bot.db_manager.add_reputation(
+            # Add rating (returns the target's updated reputation data)
+            user_data = await self.bot.db_manager.add_reputation(
                 rater_id, target_id, listing_id, rating, comment
             )
             
-            if success:
-                # Update activity scores
-                await self.update_activity_scores(rater_id, target_id)
-                
-                # Check for role updates
-                await self.check_reputation_roles(target_id)
+            if user_data:
+                # Activity scores and role checks are best-effort; run them in the background
+                await self.queue_rating_side_effects(rater_id, target_id, user_data)
                 
                 logger.info(f"Added rating {rating} from {rater_id} to {target_id}")
                 return True
@@ -45,68 +51,101 @@ class ReputationService:
             raise
         
         return False
+
+    async def queue_rating_side_effects(self, rater_id: int, target_id: int, user_data: Dict[str, Any]):
+        """Queue activity score and role updates for a new rating."""
+        if self._bg_worker is None or self._bg_worker.done():
+            self._bg_worker = asyncio.create_task(self._drain_side_effects())
+
+        # put() only waits when the queue is full, giving back-pressure under bursts
+        await self._bg_queue.put(('activity', rater_id, target_id))
+        await self._bg_queue.put(('roles', target_id, user_data))
+
+    async def _drain_side_effects(self):
+        """Process queued rating side effects, coalescing role checks per user."""
+        while True:
+            batch = [await self._bg_queue.get()]
+            await asyncio.sleep(self.SIDE_EFFECT_DEBOUNCE_SECONDS)
+            while not self._bg_queue.empty():
+                batch.append(self._bg_queue.get_nowait())
+
+            try:
+                role_checks: Dict[int, Dict[str, Any]] = {}
+                activity_scores: Dict[int, int] = {}
+                for kind, user_id, payload in batch:
+                    if kind == 'activity':
+                        activity_scores.update(await self.update_activity_scores(user_id, payload))
+                    else:
+                        # Latest stats for a user win
+                        role_checks[user_id] = payload
+
+                for user_id, user_data in role_checks.items():
+                    # The queued stats were read before this batch's activity updates
+                    if user_id in activity_scores:
+                        user_data = {**user_data, 'activity_score': activity_scores[user_id]}
+                    await self.check_reputation_roles(user_id, user_data=user_data)
+
+            except Exception as e:
+                logger.error(f"Error processing rating side effects: {e}")
+            finally:
+                for _ in batch:
+                    self._bg_queue.task_done()
     
-    async def update_activity_scores(self, rater_id: int, target_id: int):
-        """Update activity scores for rating participants."""
+    async def update_activity_scores(self, rater_id: int, target_id: int) -> Dict[int, int]:
+        """Update activity scores for rating participants and return the new scores."""
+        scores: Dict[int, int] = {}
         try:
             # Update rater activity (for giving rating)
-            await self.bot.db_manager.execute_command(
+            scores[rater_id] = await self.bot.db_manager.fetchval(
                 """
                 INSERT INTO users (user_id, activity_score, updated_at)
-                VALUES ($1, 2, $2)
+                VALUES ($1, 2, NOW())
                 ON CONFLICT (user_id)
                 DO UPDATE SET 
                     activity_score = users.activity_score + 2,
-                    updated_at = $2
+                    updated_at = NOW()
+                RETURNING activity_score
                 """,
-                rater_id, datetime.now(timezone.utc)
+                rater_id
             )
             
             # Update target activity (for receiving rating)
-            await self.bot.db_manager.execute_command(
+            scores[target_id] = await self.bot.db_manager.fetchval(
                 """
                 INSERT INTO users (user_id, activity_score, updated_at)
-                VALUES ($1, 3, $2)
+                VALUES ($1, 3, NOW())
                 ON CONFLICT (user_id)
                 DO UPDATE SET 
                     activity_score = users.activity_score + 3,
-                    updated_at = $2
+                    updated_at = NOW()
+                RETURNING activity_score
                 """,
-                target_id, datetime.now(timezone.utc)
+                target_id
             )
             
         except Exception as e:
             logger.error(f"Error updating activity scores: {e}")
+
+        return scores
     
-    async def check_reputation_roles(self, user_id: int):
-        """Check and update reputation-based roles."""
+    async def check_reputation_roles(self, user_id: int, user_data: Dict[str, Any]):
+        """Check and update reputation-based roles from the user's current reputation data."""
         try:
-            # Get user reputation
-            user_data = await self.bot.db_manager.get_user_reputation(user_id)
-            
             if not user_data:
                 return
             
             avg_rating = user_data['reputation_avg']
             rating_count = user_data['reputation_count']
             
-            # Define role thresholds
-            role_rules = [
-                {'min_rating': 4.5, 'min_count': 10, 'role': 'trusted_trader'},
-                {'min_rating': 4.0, 'min_count': 5, 'role': 'verified_trader'},
-                {'min_rating': 0.0, 'max_rating': 2.5, 'min_count': 3, 'role': 'restricted_trader'}
-            ]
-            
-            # Check which roles apply
+            # Check which roles apply (thresholds: rating, minimum count)
             applicable_roles = []
-            for rule in role_rules:
-                if rating_count >= rule['min_count']:
-                    if 'max_rating' in rule:
-                        if rule['min_rating'] <= avg_rating <= rule['max_rating']:
-                            applicable_roles.append(rule['role'])
-                    else:
-                        if avg_rating >= rule['min_rating']:
-                            applicable_roles.append(rule['role'])
+            append_role = applicable_roles.append
+            if rating_count >= 10 and avg_rating >= 4.5:
+                append_role('trusted_trader')
+            if rating_count >= 5 and avg_rating >= 4.0:
+                append_role('verified_trader')
+            if rating_count >= 3 and 0.0 <= avg_rating <= 2.5:
+                append_role('restricted_trader')
             
             # Store role updates (this would be processed by a role management system)
             if applicable_roles:
@@ -122,12 +161,11 @@ class ReputationService:
                 await self.bot.db_manager.execute_command(
                     """
                     INSERT INTO admin_actions (admin_id, action_type, target_id, details, created_at)
-                    VALUES ($1, 'role_update', $2, $3, $4)
+                    VALUES ($1, 'role_update', $2, $3, NOW())
                     """,
                     self.bot.user.id,  # Bot as admin
                     user_id,
-                    {'role': role, 'action': 'assign'},
-                    datetime.now(timezone.utc)
+                    {'role': role, 'action': 'assign'}
                 )
             
         except Exception as e:
@@ -136,89 +174,71 @@ class ReputationService:
     async def get_user_reputation_details(self, user_id: int) -> Dict[str, Any]:
         """Get detailed reputation information for a user."""
         try:
-            # Get basic reputation data
-            user_data = await self.bot.db_manager.get_user_reputation(user_id)
-            
-            # Get recent ratings
-            recent_ratings = await self.bot.db_manager.execute_query(
-                """
-                SELECT r.rating, r.comment, r.created_at, u.username as rater_name
-                FROM reputation r
-                LEFT JOIN users u ON r.rater_id = u.user_id
-                WHERE r.target_id = $1
-                ORDER BY r.created_at DESC
-                LIMIT 10
-                """,
-                user_id
-            )
-            
-            # Get rating distribution
-            rating_distribution = await self.bot.db_manager.execute_query(
+            # Build the whole payload server-side in one round-trip
+            details = await self.bot.db_manager.fetchval(
                 """
-                SELECT rating, COUNT(*) as count
-                FROM reputation
-                WHERE target_id = $1
-                GROUP BY rating
-                ORDER BY rating DESC
+                SELECT jsonb_build_object(
+                    'reputation_avg', COALESCE(u.reputation_avg, 0.0),
+                    'reputation_count', COALESCE(u.reputation_count, 0),
+                    'activity_score', COALESCE(u.activity_score, 0),
+                    'recent_ratings', COALESCE((
+                        SELECT jsonb_agg(jsonb_build_object(
+                            'rating', r.rating,
+                            'comment', r.comment,
+                            'created_at', r.created_at,
+                            'rater_name', ru.username
+                        ) ORDER BY r.created_at DESC)
+                        FROM (
+                            SELECT rating, comment, created_at, rater_id
+                            FROM reputation
+                            WHERE target_id = $1
+                            ORDER BY created_at DESC
+                            LIMIT 10
+                        ) r
+                        LEFT JOIN users ru ON r.rater_id = ru.user_id
+                    ), '[]'::jsonb),
+                    'rating_distribution', COALESCE((
+                        SELECT jsonb_agg(jsonb_build_object(
+                            'rating', h.rating,
+                            'count', h.count
+                        ) ORDER BY h.rating DESC)
+                        FROM user_rating_histogram h
+                        WHERE h.user_id = $1 AND h.count > 0
+                    ), '[]'::jsonb),
+                    'recent_trend', (
+                        SELECT CASE
+                            WHEN previous.avg_rating > 0
+                            THEN ROUND(recent.avg_rating - previous.avg_rating, 2)
+                            ELSE 0.0
+                        END
+                        FROM (
+                            SELECT COALESCE(AVG(rating), 0) as avg_rating
+                            FROM reputation
+                            WHERE target_id = $1
+                              AND created_at > NOW() - INTERVAL '30 days'
+                        ) recent, (
+                            SELECT COALESCE(AVG(rating), 0) as avg_rating
+                            FROM reputation
+                            WHERE target_id = $1
+                              AND created_at BETWEEN NOW() - INTERVAL '60 days' AND NOW() - INTERVAL '30 days'
+                        ) previous
+                    )
+                )
+                FROM (SELECT $1::BIGINT as user_id) p
+                LEFT JOIN users u ON u.user_id = p.user_id
                 """,
                 user_id
             )
             
-            # Calculate additional metrics
-            total_ratings = user_data['reputation_count']
-            if total_ratings > 0:
-                recent_trend = await self.calculate_recent_trend(user_id)
-            else:
-                recent_trend = 0.0
+            user_data = json.loads(details) if isinstance(details, str) else details
+            user_data['reliability_score'] = self.calculate_reliability_score(user_data)
             
-            return {
-                **user_data,
-                'recent_ratings': recent_ratings,
-                'rating_distribution': rating_distribution,
-                'recent_trend': recent_trend,
-                'reliability_score': self.calculate_reliability_score(user_data)
-            }
+            return user_data
             
         except Exception as e:
             logger.error(f"Error getting reputation details: {e}")
             return {}
     
-    async def calculate_recent_trend(self, user_id: int) -> float:
-        """Calculate recent rating trend for a user."""
-        try:
-            # Get ratings from last 30 days vs previous 30 days
-            recent_ratings = await self.bot.db_manager.execute_query(
-                """
-                SELECT AVG(rating) as avg_rating
-                FROM reputation
-                WHERE target_id = $1 
-                  AND created_at > NOW() - INTERVAL '30 days'
-                """,
-                user_id
-            )
-            
-            previous_ratings = await self.bot.db_manager.execute_query(
-                """
-                SELECT AVG(rating) as avg_rating
-                FROM reputation
-                WHERE target_id = $1 
-                  AND created_at BETWEEN NOW() - INTERVAL '60 days' AND NOW() - INTERVAL '30 days'
-                """,
-                user_id
-            )
-            
-            recent_avg = recent_ratings[0]['avg_rating'] if recent_ratings and recent_ratings[0]['avg_rating'] else 0.0
-            previous_avg = previous_ratings[0]['avg_rating'] if previous_ratings and previous_ratings[0]['avg_rating'] else 0.0
-            
-            if previous_avg > 0:
-                return round(recent_avg - previous_avg, 2)
-            
-            return 0.0
-            
-        except Exception as e:
-            logger.error(f"Error calculating recent trend: {e}")
-            return 0.0
-    
     def calculate_reliability_score(self, user_data: Dict[str, Any]) -> float:
         """Calculate a reliability score based on reputation and activity."""
         try:
@@ -244,10 +264,10 @@ class ReputationService:
             logger.error(f"Error calculating reliability score: {e}")
             return 0.0
     
-    def calculate_trader_score(self, user_data: Dict[str, Any], transaction_stats: Dict[str, Any]) -> Dict[str, Any]:
+    async def calculate_trader_score(self, user_data: Dict[str, Any], transaction_stats: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate comprehensive trader score with multiple metrics."""
         try:
-            avg_rating = user_data['reputation_avg']
+            avg_rating = float(user_data['reputation_avg'])
             rating_count = user_data['reputation_count']
             activity_score = user_data['activity_score']
             
@@ -266,7 +286,7 @@ class ReputationService:
             activity_normalized = min(activity_score / 50.0 * 100, 100)
             
             # Consistency bonus (10% weight) - based on rating distribution
-            consistency_score = self.calculate_consistency_score(user_data.get('user_id'))
+            consistency_score = await self.calculate_consistency_score(user_data.get('user_id'))
             
             # Weighted final score
             final_score = (
@@ -311,10 +331,9 @@ class ReputationService:
             # Get rating distribution
             ratings = await self.bot.db_manager.execute_query(
                 """
-                SELECT rating, COUNT(*) as count
-                FROM reputation
-                WHERE target_id = $1
-                GROUP BY rating
+                SELECT rating, count
+                FROM user_rating_histogram
+                WHERE user_id = $1 AND count > 0
                 ORDER BY rating
                 """,
                 user_id
@@ -323,11 +342,19 @@ class ReputationService:
             if not ratings:
                 return 50.0  # Neutral score for no ratings
             
-            total_ratings = sum(r['count'] for r in ratings)
+            # Accumulate count, sum and sum of squares in a single pass
+            total_ratings = 0
+            rating_sum = 0
+            rating_sq_sum = 0
+            for r in ratings:
+                rating, count = r['rating'], r['count']
+                total_ratings += count
+                rating_sum += rating * count
+                rating_sq_sum += rating * rating * count
             
             # Calculate variance - lower variance = higher consistency
-            mean_rating = sum(r['rating'] * r['count'] for r in ratings) / total_ratings
-            variance = sum(r['count'] * (r['rating'] - mean_rating) ** 2 for r in ratings) / total_ratings
+            mean_rating = rating_sum / total_ratings
+            variance = max(0.0, rating_sq_sum / total_ratings - mean_rating * mean_rating)
             
             # Convert variance to consistency score (0-100, higher is better)
             # Maximum variance is 4 (ratings 1 and 5 only), so we invert it
@@ -439,8 +466,8 @@ class ReputationService:
             await self.bot.db_manager.execute_command(
                 """
                 UPDATE reputation 
-                SET comment = CONCAT(comment, ' [ARCHIVED: ', $2, ']')
-                WHERE target_id = $1
+                SET archived_reason = $2, archived_at = NOW()
+                WHERE target_id = $1 AND archived_reason IS NULL
                 """,
                 user_id, reason
             )
@@ -3,234 +3,339 @@ Scheduler service for handling timed events like listing expiry and reminders.
 """
 
 import asyncio
+import heapq
+import itertools
+import json
 import logging
+import time
 from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Set, Tuple
+
+import asyncpg
+import discord
 
 from bot.ui.embeds import MarketplaceEmbeds
+from bot.ui.views_ordering import EventConfirmationView, EventRatingView
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of scheduler DMs in flight across both schedulers; Discord's
+# global rate limit is per bot, so all outbound DMs share one budget
+MAX_CONCURRENT_DMS = 20
+_dm_semaphore = asyncio.Semaphore(MAX_CONCURRENT_DMS)
+
+async def open_dm(bot, user_id: int) -> Optional[discord.DMChannel]:
+    """Open (or reuse) a DM channel by ID without needing the user in cache."""
+    try:
+        # create_dm reuses discord.py's cached private channel when one exists
+        return await bot.create_dm(discord.Object(id=user_id))
+    except discord.HTTPException as e:
+        logger.warning("Could not open DM with user %s: %s", user_id, e)
+        return None
+
+def log_failures(results: List[Any], action: str):
+    """Log exceptions captured by asyncio.gather(..., return_exceptions=True)."""
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error("Unexpected error while %s", action, exc_info=result)
+
+async def send_dm(bot, user_id: int, **kwargs) -> bool:
+    """Send a DM by user ID under the shared DM concurrency limit."""
+    async with _dm_semaphore:
+        channel = await open_dm(bot, user_id)
+        if channel is None:
+            return False
+        await channel.send(**kwargs)
+        return True
+
 class ExpiryScheduler:
     """Handles scheduled tasks for listing expiry and reminders."""
     
+    # Read-only probe served by the partial expiry/reminder indexes, so idle
+    # ticks skip the write statement below
+    DUE_LISTINGS_PROBE_SQL = """
+        SELECT EXISTS (
+            SELECT 1 FROM listings
+            WHERE active = TRUE
+              AND (expires_at <= $1 OR (expires_at <= $2 AND reminded = FALSE))
+        )
+    """
+    
+    # Most expired listings and most reminders claimed per round-trip, so a
+    # backlog is worked through in bounded batches instead of one huge result
+    CLAIM_BATCH_SIZE = 200
+    
+    # Claims both due reminders and expired listings in one round-trip. Kept as
+    # a constant so every tick reuses the same cached prepared statement.
+    # The reminder window starts after $1 so no row is claimed by both CTEs.
+    CLAIM_DUE_LISTINGS_SQL = """
+        WITH expired AS (
+            UPDATE listings
+            SET active = FALSE
+            WHERE id IN (
+                SELECT id
+                FROM listings
+                WHERE expires_at <= $1
+                  AND active = TRUE
+                ORDER BY expires_at
+                LIMIT $3
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING id, user_id, guild_id, listing_type, item, zone,
+                      subcategory, quantity, notes,
+                      EXTRACT(EPOCH FROM expires_at)::bigint AS expires_ts, TRUE AS is_expired
+        ),
+        reminded AS (
+            UPDATE listings
+            SET reminded = TRUE
+            WHERE id IN (
+                SELECT id
+                FROM listings
+                WHERE expires_at > $1
+                  AND expires_at <= $2
+                  AND active = TRUE
+                  AND reminded = FALSE
+                ORDER BY expires_at
+                LIMIT $3
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING id, user_id, guild_id, listing_type, item, zone,
+                      subcategory, quantity, notes,
+                      EXTRACT(EPOCH FROM expires_at)::bigint AS expires_ts, FALSE AS is_expired
+        )
+        SELECT * FROM expired
+        UNION ALL
+        SELECT * FROM reminded
+    """
+    
+    # Hands claimed reminders whose DM failed back to later ticks
+    RELEASE_REMINDERS_SQL = "UPDATE listings SET reminded = FALSE WHERE id = ANY($1::int[])"
+    
+    # Constant embed text, built once
+    REMINDER_TITLE = "⏰ Listing Expiring Soon!"
+    REMINDER_COLOR = MarketplaceEmbeds.WARNING_COLOR
+    REMINDER_FOOTER = "Use the button below to extend this listing"
+    EXPIRED_TITLE = "📋 Listing Expired"
+    EXPIRED_COLOR = MarketplaceEmbeds.ERROR_COLOR
+    EXPIRED_FOOTER = "You can create a new listing anytime using the marketplace channels"
+    
     def __init__(self, bot):
         self.bot = bot
-        self.embeds = MarketplaceEmbeds()
+        self.marketplace_service = bot.marketplace_service
     
     async def check_expired_listings(self):
         """Check for expired listings and send reminders."""
+        failed_reminder_ids: List[int] = []
         try:
             current_time = datetime.now(timezone.utc)
+            reminder_time = current_time + timedelta(hours=24)
             
-            # Check for listings expiring in 24 hours (reminder)
-            await self.send_expiry_reminders(current_time)
-            
-            # Check for already expired listings
-            await self.handle_expired_listings(current_time)
+            if not await self.bot.db_manager.fetchval(self.DUE_LISTINGS_PROBE_SQL, current_time, reminder_time):
+                return
             
-        except Exception as e:
-            logger.error(f"Error in expiry check: {e}")
+            while True:
+                # Atomically claim a batch of listings expiring within 24 hours and already
+                # expired ones; rows locked by another scheduler instance are skipped
+                due_listings = await self.bot.db_manager.execute_query(
+                    self.CLAIM_DUE_LISTINGS_SQL,
+                    current_time, reminder_time, self.CLAIM_BATCH_SIZE
+                )
+                
+                if not due_listings:
+                    return
+                
+                expired_listings = [listing for listing in due_listings if listing['is_expired']]
+                listings_to_remind = [listing for listing in due_listings if not listing['is_expired']]
+                
+                if listings_to_remind:
+                    failed_reminder_ids.extend(
+                        await self.send_expiry_reminders(listings_to_remind, current_time)
+                    )
+                
+                if expired_listings:
+                    await self.handle_expired_listings(expired_listings, current_time)
+                
+                # A short batch on both sides means the backlog is drained
+                if (len(expired_listings) < self.CLAIM_BATCH_SIZE
+                        and len(listings_to_remind) < self.CLAIM_BATCH_SIZE):
+                    return
+            
+        except asyncpg.PostgresError as e:
+            logger.error("Error claiming due listings: %s", e)
+        except Exception:
+            logger.exception("Error in expiry check")
+        finally:
+            # Released after the claim loop so a failed DM is not re-claimed within this check
+            if failed_reminder_ids:
+                await self.release_failed_reminders(failed_reminder_ids)
+    
+    async def send_expiry_reminders(self, listings_to_remind: List[Dict[str, Any]], current_time: datetime) -> List[int]:
+        """Send reminders for claimed listings expiring soon and return the ids that failed."""
+        results = await asyncio.gather(
+            *(self.send_expiry_reminder(listing, current_time) for listing in listings_to_remind),
+            return_exceptions=True
+        )
+        log_failures(results, "sending expiry reminders")
+        
+        failed_ids = [
+            listing['id'] for listing, sent in zip(listings_to_remind, results) if sent is not True
+        ]
+        logger.info("Sent %s expiry reminders", len(listings_to_remind) - len(failed_ids))
+        return failed_ids
     
-    async def send_expiry_reminders(self, current_time: datetime):
-        """Send reminders for listings expiring soon."""
+    async def release_failed_reminders(self, listing_ids: List[int]):
+        """Clear the reminded flag on claimed listings whose reminder was not delivered."""
         try:
-            # Get listings expiring in 24 hours
-            reminder_time = current_time + timedelta(hours=24)
-            
-            listings_to_remind = await self.bot.db_manager.execute_query(
-                """
-                SELECT l.*, u.username
-                FROM listings l
-                LEFT JOIN users u ON l.user_id = u.user_id
-                WHERE l.expires_at BETWEEN $1 AND $2
-                  AND l.active = TRUE
-                  AND l.reminded = FALSE
-                """,
-                current_time, reminder_time
-            )
-            
-            for listing in listings_to_remind:
-                await self.send_expiry_reminder(listing)
-                await self.bot.db_manager.mark_listing_reminded(listing['id'])
-            
-            if listings_to_remind:
-                logger.info(f"Sent {len(listings_to_remind)} expiry reminders")
-            
+            await self.bot.db_manager.execute_command(self.RELEASE_REMINDERS_SQL, listing_ids)
         except Exception as e:
-            logger.error(f"Error sending expiry reminders: {e}")
+            logger.error("Error releasing %s failed expiry reminders: %s", len(listing_ids), e)
     
-    async def send_expiry_reminder(self, listing: Dict[str, Any]):
-        """Send expiry reminder to a user."""
+    async def send_expiry_reminder(self, listing: Dict[str, Any], current_time: datetime) -> bool:
+        """Send expiry reminder to a user, returning whether it was delivered."""
         try:
-            user = self.bot.get_user(listing['user_id'])
-            if not user:
-                return
-            
             # Create reminder embed
-            embed = self.create_expiry_reminder_embed(listing)
+            embed = self.create_expiry_reminder_embed(listing, current_time)
             
             # Create extend button view
             view = ExtendListingView(self.bot, listing['id'])
             
-            await user.send(embed=embed, view=view)
+            if not await send_dm(self.bot, listing['user_id'], embed=embed, view=view):
+                return False
             
-            logger.info(f"Sent expiry reminder for listing {listing['id']} to user {listing['user_id']}")
+            logger.info("Sent expiry reminder for listing %s to user %s", listing['id'], listing['user_id'])
+            return True
             
-        except Exception as e:
-            logger.error(f"Error sending expiry reminder for listing {listing['id']}: {e}")
+        except discord.HTTPException as e:
+            logger.error("Error sending expiry reminder for listing %s: %s", listing['id'], e)
+            return False
     
-    def create_expiry_reminder_embed(self, listing: Dict[str, Any]) -> "discord.Embed":
+    @staticmethod
+    def _listing_details_value(listing: Dict[str, Any], zone: str) -> str:
+        """Format the details field shared by the expiry embeds."""
+        return (
+            f"**Zone:** {zone}\n"
+            f"**Category:** {listing['subcategory']}\n"
+            f"**Item:** {listing['item']}\n"
+            f"**Quantity:** {listing['quantity']}"
+        )
+    
+    def create_expiry_reminder_embed(self, listing: Dict[str, Any], current_time: datetime) -> discord.Embed:
         """Create expiry reminder embed."""
-        import discord
+        zone = listing['zone'].title()
         
         embed = discord.Embed(
-            title="⏰ Listing Expiring Soon!",
+            title=self.REMINDER_TITLE,
             description=(
                 f"Your **{listing['listing_type']}** listing for **{listing['item']}** "
-                f"in **{listing['zone'].title()}** will expire in less than 24 hours."
+                f"in **{zone}** will expire in less than 24 hours."
             ),
-            color=self.embeds.COLORS['warning'],
-            timestamp=datetime.now(timezone.utc)
+            color=self.REMINDER_COLOR,
+            timestamp=current_time
         )
         
         embed.add_field(
             name="📂 Details",
-            value=(
-                f"**Zone:** {listing['zone'].title()}\n"
-                f"**Category:** {listing['subcategory']}\n"
-                f"**Item:** {listing['item']}\n"
-                f"**Quantity:** {listing['quantity']}"
-            ),
+            value=self._listing_details_value(listing, zone),
             inline=True
         )
         
         embed.add_field(
             name="⏰ Expires",
-            value=f"<t:{int(listing['expires_at'].timestamp())}:R>",
+            value=f"<t:{listing['expires_ts']}:R>",
             inline=True
         )
         
-        if listing['notes']:
+        notes = listing['notes']
+        if notes:
             embed.add_field(
                 name="📝 Notes",
-                value=listing['notes'][:200] + ("..." if len(listing['notes']) > 200 else ""),
+                value=notes[:200] + ("..." if len(notes) > 200 else ""),
                 inline=False
             )
         
-        embed.set_footer(text="Use the button below to extend this listing")
+        embed.set_footer(text=self.REMINDER_FOOTER)
         
         return embed
     
-    async def handle_expired_listings(self, current_time: datetime):
-        """Handle listings that have already expired."""
-        try:
-            # Get expired listings
-            expired_listings = await self.bot.db_manager.execute_query(
-                """
-                SELECT l.*, u.username
-                FROM listings l
-                LEFT JOIN users u ON l.user_id = u.user_id
-                WHERE l.expires_at <= $1
-                  AND l.active = TRUE
-                """,
-                current_time
+    async def handle_expired_listings(self, expired_listings: List[Dict[str, Any]], current_time: datetime):
+        """Notify owners of claimed expired listings and refresh their zones."""
+        results = await asyncio.gather(
+            *(self.expire_listing(listing, current_time) for listing in expired_listings),
+            return_exceptions=True
+        )
+        log_failures(results, "sending expiry notifications")
+        
+        # Repeat requests for the same zone collapse into one refresh
+        for listing in expired_listings:
+            self.marketplace_service.request_zone_refresh(
+                listing['guild_id'], listing['listing_type'], listing['zone']
             )
-            
-            for listing in expired_listings:
-                await self.expire_listing(listing)
-            
-            if expired_listings:
-                logger.info(f"Expired {len(expired_listings)} listings")
-            
-        except Exception as e:
-            logger.error(f"Error handling expired listings: {e}")
+        
+        logger.info("Expired %s listings", len(expired_listings))
     
-    async def expire_listing(self, listing: Dict[str, Any]):
-        """Expire a single listing."""
+    async def expire_listing(self, listing: Dict[str, Any], current_time: datetime):
+        """Notify the owner of an already-deactivated listing."""
         try:
-            # Mark listing as inactive
-            await self.bot.db_manager.execute_command(
-                "UPDATE listings SET active = FALSE WHERE id = $1",
-                listing['id']
-            )
-            
             # Send expiry notification to user
-            user = self.bot.get_user(listing['user_id'])
-            if user:
-                embed = self.create_expiry_notification_embed(listing)
-                await user.send(embed=embed)
-            
-            # Refresh marketplace embeds
-            from bot.services.marketplace import MarketplaceService
-            marketplace_service = MarketplaceService(self.bot)
-            await marketplace_service.refresh_marketplace_embeds_for_zone(
-                listing['guild_id'], listing['listing_type'], listing['zone']
-            )
+            embed = self.create_expiry_notification_embed(listing, current_time)
+            await send_dm(self.bot, listing['user_id'], embed=embed)
             
-            logger.info(f"Expired listing {listing['id']}")
+            logger.info("Expired listing %s", listing['id'])
             
-        except Exception as e:
-            logger.error(f"Error expiring listing {listing['id']}: {e}")
+        except discord.HTTPException as e:
+            logger.error("Error expiring listing %s: %s", listing['id'], e)
     
-    def create_expiry_notification_embed(self, listing: Dict[str, Any]) -> "discord.Embed":
+    def create_expiry_notification_embed(self, listing: Dict[str, Any], current_time: datetime) -> discord.Embed:
         """Create expiry notification embed."""
-        import discord
+        zone = listing['zone'].title()
         
         embed = discord.Embed(
-            title="📋 Listing Expired",
+            title=self.EXPIRED_TITLE,
             description=(
                 f"Your **{listing['listing_type']}** listing for **{listing['item']}** "
-                f"in **{listing['zone'].title()}** has expired and been removed from the marketplace."
+                f"in **{zone}** has expired and been removed from the marketplace."
             ),
-            color=self.embeds.COLORS['error'],
-            timestamp=datetime.now(timezone.utc)
+            color=self.EXPIRED_COLOR,
+            timestamp=current_time
         )
         
         embed.add_field(
             name="📂 Details",
-            value=(
-                f"**Zone:** {listing['zone'].title()}\n"
-                f"**Category:** {listing['subcategory']}\n"
-                f"**Item:** {listing['item']}\n"
-                f"**Quantity:** {listing['quantity']}"
-            ),
+            value=self._listing_details_value(listing, zone),
             inline=False
         )
         
-        embed.set_footer(text="You can create a new listing anytime using the marketplace channels")
+        embed.set_footer(text=self.EXPIRED_FOOTER)
         
         return embed
     
     async def extend_listing(self, listing_id: int, user_id: int, days: int = 14) -> bool:
         """Extend a listing's expiry date."""
         try:
-            # Verify user owns the listing
-            listing = await self.bot.db_manager.execute_query(
-                "SELECT * FROM listings WHERE id = $1 AND user_id = $2 AND active = TRUE",
-                listing_id, user_id
+            # Push the expiry out if the user owns the listing, reading back only the new timestamp
+            new_expiry = await self.bot.db_manager.fetchval(
+                """
+                UPDATE listings
+                SET expires_at = expires_at + make_interval(days => $3), reminded = FALSE
+                WHERE id = $1 AND user_id = $2 AND active = TRUE
+                RETURNING expires_at
+                """,
+                listing_id, user_id, days
             )
             
-            if not listing:
+            if new_expiry is None:
                 return False
             
-            listing_data = listing[0]
+            # Let the scheduler wake up for the new reminder/expiry times
+            scheduler_service = getattr(self.bot, 'scheduler_service', None)
+            if scheduler_service:
+                scheduler_service.schedule_listing_deadlines(new_expiry)
             
-            # Calculate new expiry date
-            current_expiry = listing_data['expires_at']
-            new_expiry = current_expiry + timedelta(days=days)
-            
-            # Update listing
-            await self.bot.db_manager.execute_command(
-                "UPDATE listings SET expires_at = $1, reminded = FALSE WHERE id = $2",
-                new_expiry, listing_id
-            )
-            
-            logger.info(f"Extended listing {listing_id} by {days} days")
+            logger.info("Extended listing %s by %s days", listing_id, days)
             return True
             
         except Exception as e:
-            logger.error(f"Error extending listing {listing_id}: {e}")
+            logger.error("Error extending listing %s: %s", listing_id, e)
             return False
     
     async def schedule_listing_activation(self, listing_id: int, activation_time: datetime):
@@ -252,7 +357,7 @@ class ExpiryScheduler:
                 )
             
         except Exception as e:
-            logger.error(f"Error scheduling listing activation: {e}")
+            logger.error("Error scheduling listing activation: %s", e)
     
     async def activate_listing(self, listing_id: int):
         """Activate a scheduled listing."""
@@ -273,18 +378,16 @@ class ExpiryScheduler:
                 listing_data = listing[0]
                 
                 # Refresh marketplace embeds
-                from bot.services.marketplace import MarketplaceService
-                marketplace_service = MarketplaceService(self.bot)
-                await marketplace_service.refresh_marketplace_embeds_for_zone(
+                self.marketplace_service.request_zone_refresh(
                     listing_data['guild_id'], 
                     listing_data['listing_type'], 
                     listing_data['zone']
                 )
             
-            logger.info(f"Activated listing {listing_id}")
+            logger.info("Activated listing %s", listing_id)
             
         except Exception as e:
-            logger.error(f"Error activating listing: {e}")
+            logger.error("Error activating listing: %s", e)
 
 class ExtendListingView:
     """View for extending listing expiry."""
@@ -296,55 +399,184 @@ class ExtendListingView:
     # This would implement the Discord UI for extending listings
     # For now, we'll keep it as a placeholder class
     pass
-import asyncio
-import logging
-from datetime import datetime, timezone
-from typing import Dict, Any, List
-import discord
-
-logger = logging.getLogger(__name__)
 
 class SchedulerService:
     """Service for handling scheduled events and notifications."""
 
+    # Longest the loop sleeps, so pending events not registered as deadlines are
+    # still picked up; listing expiries without a deadline fall back to the
+    # client's five-minute expiry_check task
+    MAX_IDLE_SECONDS = 300
+
+    # Constant embed text, built once
+    EVENT_STARTED_TITLE = "⏳ Event Started"
+    EVENT_STARTED_COLOR = 0xFFAA00
+    RATING_PROMPT_TITLE = "⭐ Rate Your Experience"
+    RATING_PROMPT_COLOR = 0x3B82F6
+    RATING_PROMPT_FOOTER = "Your rating helps the community!"
+    SUMMARY_TITLE = "📊 Trade Rating Summary"
+    SUMMARY_COLOR = 0x00FF00
+    SUMMARY_FOOTER = "Event rating summary"
+
+    # Claims due rating prompts so each is sent once, even across restarts, and
+    # returns each event's details and confirmed buyers in the same round-trip
+    CLAIM_RATING_PROMPTS_SQL = """
+        WITH claimed AS (
+            UPDATE scheduled_events
+            SET rating_prompted_at = $1
+            WHERE rating_prompt_at <= $1
+              AND rating_prompted_at IS NULL
+            RETURNING id, listing_id
+        )
+        SELECT c.id, l.user_id AS seller_id, l.item, l.zone,
+               ARRAY(
+                   SELECT ec.user_id FROM event_confirmations ec
+                   WHERE ec.event_id = c.id AND ec.confirmed = TRUE AND ec.role = 'buyer'
+               ) AS buyer_ids
+        FROM claimed c
+        JOIN listings l ON c.listing_id = l.id
+    """
+
     def __init__(self, bot):
         self.bot = bot
         self.running = False
+        self.marketplace_service = bot.marketplace_service
+        # Min-heap of (deadline_ts, counter, kind); the counter keeps tuple comparison on ints
+        self._deadlines: List[Tuple[float, int, str]] = []
+        self._deadline_counter = itertools.count()
+        # Set whenever a new deadline is registered so the loop can re-plan its sleep
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
 
     async def start(self):
         """Start the scheduler service."""
         self.running = True
-        asyncio.create_task(self.event_loop())
+        self._task = asyncio.create_task(self.event_loop(), name="scheduler-event-loop")
+        self._task.add_done_callback(self._on_event_loop_done)
         logger.info("Scheduler service started")
 
     async def stop(self):
         """Stop the scheduler service."""
         self.running = False
+        self._wakeup.set()
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
         logger.info("Scheduler service stopped")
 
+    def _on_event_loop_done(self, task: asyncio.Task):
+        """Log the event loop exiting with an exception instead of losing it silently."""
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            logger.error("Scheduler event loop crashed", exc_info=exc)
+
+    def schedule_deadline(self, when: datetime, kind: str = 'event'):
+        """Register a time at which the scheduler should run its checks."""
+        heapq.heappush(self._deadlines, (when.timestamp(), next(self._deadline_counter), kind))
+        self._wakeup.set()
+
+    def schedule_listing_deadlines(self, expires_at: datetime):
+        """Register the expiry reminder and expiry deadlines for a listing."""
+        self.schedule_deadline(expires_at - timedelta(hours=24), 'listing')
+        self.schedule_deadline(expires_at, 'listing')
+
+    async def load_deadlines(self):
+        """Seed the deadline heap from pending events, active listings and rating prompts."""
+        try:
+            events = await self.bot.db_manager.execute_query(
+                "SELECT event_time FROM scheduled_events WHERE status = 'pending'"
+            )
+            for event in events:
+                self.schedule_deadline(event['event_time'], 'event')
+
+            listings = await self.bot.db_manager.execute_query(
+                "SELECT expires_at FROM listings WHERE active = TRUE AND expires_at IS NOT NULL"
+            )
+            for listing in listings:
+                self.schedule_listing_deadlines(listing['expires_at'])
+
+            prompts = await self.bot.db_manager.execute_query(
+                """
+                SELECT rating_prompt_at FROM scheduled_events
+                WHERE rating_prompt_at IS NOT NULL AND rating_prompted_at IS NULL
+                """
+            )
+            for prompt in prompts:
+                self.schedule_deadline(prompt['rating_prompt_at'], 'rating')
+
+            logger.info("Loaded %s scheduler deadlines", len(self._deadlines))
+
+        except Exception as e:
+            logger.error("Error loading scheduler deadlines: %s", e)
+
+    def pop_due_deadlines(self) -> Set[str]:
+        """Pop every deadline that has passed and return their kinds."""
+        now = time.time()
+        due = set()
+        while self._deadlines and self._deadlines[0][0] <= now:
+            due.add(heapq.heappop(self._deadlines)[2])
+        return due
+
+    def seconds_until_next_deadline(self) -> float:
+        """Seconds to sleep before the next deadline, capped at MAX_IDLE_SECONDS."""
+        if not self._deadlines:
+            return self.MAX_IDLE_SECONDS
+        return max(0.0, min(self._deadlines[0][0] - time.time(), self.MAX_IDLE_SECONDS))
+
+    async def wait_for_next_deadline(self):
+        """Sleep until the next deadline or until a new deadline is registered."""
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=self.seconds_until_next_deadline())
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._wakeup.clear()
+
     async def event_loop(self):
-        """Main event loop for checking scheduled events."""
+        """Main event loop: sleep until the next deadline, then run the due checks."""
+        await self.load_deadlines()
         while self.running:
             try:
+                due = self.pop_due_deadlines()
+
+                # Events are also checked on idle wakeups as a fallback; listings only
+                # run on their own deadlines here
                 await self.check_pending_events()
-                await asyncio.sleep(60)  # Check every minute
+
+                if 'listing' in due and self.bot.scheduler:
+                    await self.bot.scheduler.check_expired_listings()
+
+                if 'rating' in due:
+                    await self.check_rating_prompts()
+
+                await self.wait_for_next_deadline()
             except Exception as e:
-                logger.error(f"Error in scheduler event loop: {e}")
+                logger.error("Error in scheduler event loop: %s", e)
                 await asyncio.sleep(60)
 
     async def check_pending_events(self):
         """Check for events that should trigger."""
         try:
-            pending_events = await self.bot.db_manager.get_pending_events()
+            # Fetch and claim due events on a single connection/transaction
+            pending_events = await self.bot.db_manager.claim_pending_events()
+            
+            if not pending_events:
+                return
             
-            for event in pending_events:
-                await self.trigger_event(event)
+            results = await asyncio.gather(
+                *(self.trigger_event(event) for event in pending_events),
+                return_exceptions=True
+            )
+            log_failures(results, "triggering events")
 
         except Exception as e:
-            logger.error(f"Error checking pending events: {e}")
+            logger.error("Error checking pending events: %s", e)
 
     async def trigger_event(self, event: Dict[str, Any]):
-        """Trigger a scheduled event."""
+        """Trigger a scheduled event that has already been marked started."""
         try:
             listing_id = event['listing_id']
             guild_id = event['guild_id']
@@ -352,22 +584,10 @@ class SchedulerService:
             item_name = event['item']
             zone = event['zone']
 
-            # Mark event as started
-            await self.bot.db_manager.execute_command(
-                "UPDATE scheduled_events SET status = 'started' WHERE id = $1",
-                event['id']
-            )
-
-            # Deactivate the listing
-            await self.bot.db_manager.execute_command(
-                "UPDATE listings SET active = FALSE WHERE id = $1",
-                listing_id
-            )
-
             # Get guild and create notification
             guild = self.bot.get_guild(guild_id)
             if not guild:
-                logger.warning(f"Guild {guild_id} not found for event")
+                logger.warning("Guild %s not found for event", guild_id)
                 return
 
             # Get queue participants
@@ -376,208 +596,188 @@ class SchedulerService:
             for item_queues in queue_data.values():
                 participants.extend(item_queues)
 
-            # First, remove the item from the seller's listing and refresh embed
-            await self.remove_item_from_listing(listing_id, item_name, guild_id, zone)
+            # The claim already deactivated the listing; refresh its zone embed
+            self.marketplace_service.request_zone_refresh(guild_id, event['listing_type'], zone)
 
             # Create notification embed
             embed = discord.Embed(
-                title="⏳ Event Started",
+                title=self.EVENT_STARTED_TITLE,
                 description=f"The event for **{item_name}** in **{zone.title()}** has started!\n\nPlease confirm your participation.",
-                color=0xFFAA00,
+                color=self.EVENT_STARTED_COLOR,
                 timestamp=datetime.now(timezone.utc)
             )
 
-            # Create confirmation view for each participant
-            from bot.ui.views_ordering import EventConfirmationView
-            
-            # Send notification to seller
-            try:
-                seller = guild.get_member(seller_id)
-                if seller:
-                    seller_view = EventConfirmationView(self.bot, event['id'], "seller", seller_id)
-                    await seller.send(embed=embed, view=seller_view)
-                    logger.info(f"Sent event notification to seller {seller_id}")
-            except discord.Forbidden:
-                logger.warning(f"Could not DM seller {seller_id}")
-
-            # Send notifications to queue participants
-            for participant_id in participants:
-                try:
-                    participant = guild.get_member(participant_id)
-                    if participant:
-                        participant_view = EventConfirmationView(self.bot, event['id'], "buyer", participant_id)
-                        await participant.send(embed=embed, view=participant_view)
-                        logger.info(f"Sent event notification to participant {participant_id}")
-                except discord.Forbidden:
-                    logger.warning(f"Could not DM participant {participant_id}")
-
-            logger.info(f"Triggered event {event['id']} for listing {listing_id}")
+            # Notify the seller and all queue participants concurrently
+            results = await asyncio.gather(
+                self.send_event_notification(event['id'], seller_id, "seller", embed),
+                *(
+                    self.send_event_notification(event['id'], participant_id, "buyer", embed)
+                    for participant_id in participants
+                ),
+                return_exceptions=True
+            )
+            log_failures(results, "sending event notifications")
+
+            logger.info("Triggered event %s for listing %s", event['id'], listing_id)
 
         except Exception as e:
-            logger.error(f"Error triggering event {event['id']}: {e}")
+            logger.error("Error triggering event %s: %s", event['id'], e)
 
-    async def remove_item_from_listing(self, listing_id: int, item_name: str, guild_id: int, zone: str):
-        """Remove item from listing and refresh marketplace embed."""
+    async def send_event_notification(self, event_id: int, user_id: int, role: str, embed: discord.Embed):
+        """DM an event confirmation prompt to a seller or buyer."""
         try:
-            # Get listing info first
-            listing_info = await self.bot.db_manager.execute_query(
-                "SELECT listing_type, zone FROM listings WHERE id = $1",
-                listing_id
-            )
-            
-            if not listing_info:
-                logger.warning(f"Listing {listing_id} not found")
-                return
-                
-            listing_data = listing_info[0]
-            listing_type = listing_data['listing_type']
-            
-            # Mark listing as inactive (remove from marketplace)
-            await self.bot.db_manager.execute_command(
-                "UPDATE listings SET active = FALSE WHERE id = $1",
-                listing_id
-            )
-            
-            # Refresh marketplace embeds to show the item is removed
-            from bot.services.marketplace import MarketplaceService
-            marketplace_service = MarketplaceService(self.bot)
-            await marketplace_service.refresh_marketplace_embeds_for_zone(
-                guild_id, listing_type, zone
-            )
-            
-            logger.info(f"Removed listing {listing_id} for item {item_name} and refreshed embeds")
-            
-        except Exception as e:
-            logger.error(f"Error removing item from listing: {e}")
+            view = EventConfirmationView(self.bot, event_id, role, user_id)
+            if await send_dm(self.bot, user_id, embed=embed, view=view):
+                logger.info("Sent event notification to %s %s", role, user_id)
+        except discord.HTTPException as e:
+            logger.warning("Could not DM %s %s: %s", role, user_id, e)
 
     async def schedule_rating_prompt(self, event_id: int, delay_seconds: int = 10):
-        """Schedule rating prompt after delay."""
+        """Persist the rating prompt time for an event and wake the loop for it."""
         try:
-            print(delay_seconds)
-            await asyncio.sleep(delay_seconds)
+            prompt_at = datetime.now(timezone.utc) + timedelta(seconds=delay_seconds)
             
-            # Get event details
-            event_data = await self.bot.db_manager.execute_query(
+            # Only the first call per event sets the time, so repeat confirmations don't re-prompt
+            scheduled = await self.bot.db_manager.fetchval(
                 """
-                SELECT se.*, l.user_id as seller_id, l.item, l.zone, l.guild_id
-                FROM scheduled_events se
-                JOIN listings l ON se.listing_id = l.id
-                WHERE se.id = $1
+                UPDATE scheduled_events
+                SET rating_prompt_at = $2
+                WHERE id = $1 AND rating_prompt_at IS NULL
+                RETURNING rating_prompt_at
                 """,
-                event_id
+                event_id, prompt_at
             )
+            
+            if scheduled:
+                self.schedule_deadline(scheduled, 'rating')
+                logger.info("Scheduled rating prompt for event %s at %s", event_id, scheduled)
+            
+        except Exception as e:
+            logger.error("Error scheduling rating prompt for event %s: %s", event_id, e)
 
-            if not event_data:
-                logger.warning(f"No event data found for event_id {event_id}")
+    async def check_rating_prompts(self):
+        """Send the rating prompts that have come due."""
+        try:
+            due_prompts = await self.bot.db_manager.execute_query(
+                self.CLAIM_RATING_PROMPTS_SQL,
+                datetime.now(timezone.utc)
+            )
+            
+            if not due_prompts:
                 return
-
-            event = event_data[0]
             
-            # Get confirmed participants from database
-            confirmed_participants = await self.bot.db_manager.execute_query(
-                """
-                SELECT user_id FROM event_confirmations 
-                WHERE event_id = $1 AND confirmed = TRUE AND role = 'buyer'
-                """,
-                event_id
+            results = await asyncio.gather(
+                *(self.send_rating_prompts(event) for event in due_prompts),
+                return_exceptions=True
             )
+            log_failures(results, "sending rating prompts")
+            
+        except Exception as e:
+            logger.error("Error checking rating prompts: %s", e)
+
+    async def send_rating_prompts(self, event: Dict[str, Any]):
+        """Send rating prompts to a claimed event's confirmed buyers."""
+        event_id = event['id']
+        try:
+            confirmed_participants = event['buyer_ids']
 
             if not confirmed_participants:
-                logger.info(f"No confirmed participants found for event {event_id}")
+                logger.info("No confirmed participants found for event %s", event_id)
                 return
 
             # Send rating prompts to confirmed buyers only
-            from bot.ui.views_ordering import EventRatingView
-            
-            logger.info(f"Sending rating prompts to {len(confirmed_participants)} confirmed participants")
-            
-            for participant_data in confirmed_participants:
-                participant_id = participant_data['user_id']
-                try:
-                    guild = self.bot.get_guild(event['guild_id'])
-                    if guild:
-                        participant = guild.get_member(participant_id)
-                        if participant:
-                            view = EventRatingView(self.bot, event_id, event['seller_id'])
-                            
-                            embed = discord.Embed(
-                                title="⭐ Rate Your Experience",
-                                description=f"Please rate your experience with the **{event['item']}** event in **{event['zone'].title()}**",
-                                color=0x3B82F6,
-                                timestamp=datetime.now(timezone.utc)
-                            )
-                            
-                            embed.add_field(
-                                name="Seller",
-                                value=f"<@{event['seller_id']}>",
-                                inline=True
-                            )
-                            
-                            embed.add_field(
-                                name="Item",
-                                value=event['item'],
-                                inline=True
-                            )
-                            
-                            embed.add_field(
-                                name="Zone",
-                                value=event['zone'].title(),
-                                inline=True
-                            )
-                            
-                            embed.set_footer(text="Your rating helps the community!")
-                            
-                            await participant.send(embed=embed, view=view)
-                            logger.info(f"Sent rating prompt to participant {participant_id}")
-                        else:
-                            logger.warning(f"Could not find member {participant_id} in guild")
-                    else:
-                        logger.warning(f"Could not find guild {event['guild_id']}")
-                except Exception as e:
-                    logger.error(f"Error sending rating prompt to {participant_id}: {e}")
+            logger.info("Sending rating prompts to %s confirmed participants", len(confirmed_participants))
+
+            # The prompt embed is identical for every participant, so build it once
+            zone_title = event['zone'].title()
+            embed = discord.Embed(
+                title=self.RATING_PROMPT_TITLE,
+                description=f"Please rate your experience with the **{event['item']}** event in **{zone_title}**",
+                color=self.RATING_PROMPT_COLOR,
+                timestamp=datetime.now(timezone.utc)
+            )
+            
+            embed.add_field(
+                name="Seller",
+                value=f"<@{event['seller_id']}>",
+                inline=True
+            )
+            
+            embed.add_field(
+                name="Item",
+                value=event['item'],
+                inline=True
+            )
+            
+            embed.add_field(
+                name="Zone",
+                value=zone_title,
+                inline=True
+            )
+            
+            embed.set_footer(text=self.RATING_PROMPT_FOOTER)
+            
+            results = await asyncio.gather(
+                *(
+                    self.send_rating_prompt(event_id, participant_id, event['seller_id'], embed)
+                    for participant_id in confirmed_participants
+                ),
+                return_exceptions=True
+            )
+            log_failures(results, "sending rating prompts")
 
         except Exception as e:
-            logger.error(f"Error in rating prompt schedule: {e}")
+            logger.error("Error sending rating prompts for event %s: %s", event_id, e)
+
+    async def send_rating_prompt(self, event_id: int, participant_id: int, seller_id: int, embed: discord.Embed):
+        """DM a rating prompt to a confirmed participant."""
+        try:
+            # Each message gets its own view: the rating modal disables
+            # the buttons of the view it was opened from
+            view = EventRatingView(self.bot, event_id, seller_id)
+            if await send_dm(self.bot, participant_id, embed=embed, view=view):
+                logger.info("Sent rating prompt to participant %s", participant_id)
+        except discord.HTTPException as e:
+            logger.error("Error sending rating prompt to %s: %s", participant_id, e)
 
     async def check_ratings_complete_and_send_summary(self, event_id: int):
         """Check if all ratings are complete and send summary to mods channel."""
         try:
-            # Get event and confirmed participants
-            event_data = await self.bot.db_manager.execute_query(
+            # Fetch the event, confirmed buyer count and submitted ratings in one round-trip
+            summary_json = await self.bot.db_manager.fetchval(
                 """
-                SELECT se.*, l.user_id as seller_id, l.item, l.zone, l.guild_id
-                FROM scheduled_events se
-                JOIN listings l ON se.listing_id = l.id
-                WHERE se.id = $1
+                SELECT jsonb_build_object(
+                    'event', (
+                        SELECT jsonb_build_object(
+                            'seller_id', l.user_id, 'item', l.item, 'zone', l.zone, 'guild_id', l.guild_id
+                        )
+                        FROM scheduled_events se
+                        JOIN listings l ON se.listing_id = l.id
+                        WHERE se.id = $1
+                    ),
+                    'confirmed_count', (
+                        SELECT COUNT(*) FROM event_confirmations
+                        WHERE event_id = $1 AND confirmed = TRUE AND role = 'buyer'
+                    ),
+                    'ratings', COALESCE((
+                        SELECT jsonb_agg(jsonb_build_object(
+                            'rater_id', rater_id, 'rating', rating, 'comment', comment
+                        ))
+                        FROM event_ratings
+                        WHERE event_id = $1
+                    ), '[]'::jsonb)
+                )
                 """,
                 event_id
             )
 
-            if not event_data:
+            summary = json.loads(summary_json)
+            event = summary['event']
+            if not event:
                 return
 
-            event = event_data[0]
-            
-            # Get confirmed participants
-            confirmed_participants = await self.bot.db_manager.execute_query(
-                """
-                SELECT user_id FROM event_confirmations 
-                WHERE event_id = $1 AND confirmed = TRUE AND role = 'buyer'
-                """,
-                event_id
-            )
-
-            # Get submitted ratings
-            submitted_ratings = await self.bot.db_manager.execute_query(
-                """
-                SELECT rater_id, rating, comment, created_at 
-                FROM event_ratings 
-                WHERE event_id = $1
-                """,
-                event_id
-            )
-
-            confirmed_count = len(confirmed_participants)
+            submitted_ratings = summary['ratings']
+            confirmed_count = summary['confirmed_count']
             ratings_count = len(submitted_ratings)
 
             # Check if all ratings are submitted
@@ -585,7 +785,7 @@ class SchedulerService:
                 await self.send_rating_summary(event, submitted_ratings)
 
         except Exception as e:
-            logger.error(f"Error checking ratings completion: {e}")
+            logger.error("Error checking ratings completion: %s", e)
 
     async def send_rating_summary(self, event: dict, ratings: list):
         """Send rating summary to mods channel."""
@@ -602,19 +802,19 @@ class SchedulerService:
             )
 
             if not channel_data or not channel_data[0]['admin_channel_id']:
-                logger.info(f"No mods channel configured for guild {guild_id}, skipping summary")
+                logger.info("No mods channel configured for guild %s, skipping summary", guild_id)
                 return
 
             channel_id = channel_data[0]['admin_channel_id']
             guild = self.bot.get_guild(guild_id)
             
             if not guild:
-                logger.warning(f"Could not find guild {guild_id}")
+                logger.warning("Could not find guild %s", guild_id)
                 return
 
             channel = guild.get_channel(channel_id)
             if not channel:
-                logger.warning(f"Could not find channel {channel_id}")
+                logger.warning("Could not find channel %s", channel_id)
                 return
 
             # Calculate average rating
@@ -623,9 +823,9 @@ class SchedulerService:
             
             # Create summary embed
             embed = discord.Embed(
-                title="📊 Trade Rating Summary",
+                title=self.SUMMARY_TITLE,
                 description=f"Event ratings have been collected for **{event['item']}** in **{event['zone'].title()}**",
-                color=0x00FF00,
+                color=self.SUMMARY_COLOR,
                 timestamp=datetime.now(timezone.utc)
             )
 
@@ -637,7 +837,7 @@ class SchedulerService:
 
             embed.add_field(
                 name="⭐ Average Rating",
-                value=f"{avg_rating:.1f}/5 ({'⭐' * int(avg_rating)})",
+                value=f"{avg_rating:.1f}/5 ({MarketplaceEmbeds.star_run(avg_rating)})",
                 inline=True
             )
 
@@ -647,14 +847,16 @@ class SchedulerService:
                 inline=True
             )
 
-            # Add buyer ratings
-            buyers_text = ""
+            # Add buyer ratings, collected as lines and joined once
+            buyer_lines = []
             for rating_data in ratings:
-                rating_stars = "⭐" * rating_data['rating']
-                buyers_text += f"<@{rating_data['rater_id']}>: {rating_stars} ({rating_data['rating']}/5)\n"
-                if rating_data['comment']:
-                    buyers_text += f"💬 *{rating_data['comment'][:100]}{'...' if len(rating_data['comment']) > 100 else ''}*\n"
-                buyers_text += "\n"
+                rating = rating_data['rating']
+                comment = rating_data['comment']
+                buyer_lines.append(f"<@{rating_data['rater_id']}>: {MarketplaceEmbeds.star_run(rating)} ({rating}/5)\n")
+                if comment:
+                    buyer_lines.append(f"💬 *{comment[:100]}{'...' if len(comment) > 100 else ''}*\n")
+                buyer_lines.append("\n")
+            buyers_text = "".join(buyer_lines)
 
             if buyers_text:
                 embed.add_field(
@@ -663,10 +865,10 @@ class SchedulerService:
                     inline=False
                 )
 
-            embed.set_footer(text="Event rating summary")
+            embed.set_footer(text=self.SUMMARY_FOOTER)
 
             await channel.send(embed=embed)
-            logger.info(f"Sent rating summary to channel {channel_id}")
+            logger.info("Sent rating summary to channel %s", channel_id)
 
         except Exception as e:
-            logger.error(f"Error sending rating summary: {e}")
+            logger.error("Error sending rating summary: %s", e)
@@ -1,13 +1,37 @@
+import heapq
 import discord
+from collections import defaultdict
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from itertools import chain, islice
+from typing import List, Dict, Any, Optional, Final, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=1024)
+def format_scheduled_time(scheduled_time: datetime) -> str:
+    """Format a scheduled time as Discord absolute and relative timestamps."""
+    # Listings on a page often share a slot, so the rendered tags are cached
+    timestamp = int(scheduled_time.timestamp())
+    return f"<t:{timestamp}:f> (<t:{timestamp}:R>)"
+
+@lru_cache(maxsize=1024)
+def format_relative_time(moment: datetime) -> str:
+    """Format a time as a Discord relative timestamp."""
+    return f"<t:{int(moment.timestamp())}:R>"
+
+@lru_cache(maxsize=4096)
+def format_mention(user_id: int) -> str:
+    """Format a user mention."""
+    return f"<@{user_id}>"
+
 class MarketplaceEmbeds:
     """Creates Discord embeds for marketplace functionality."""
 
+    # Stateless: everything lives on the class, so instances carry no __dict__
+    __slots__ = ()
+
     COLORS = {
         'primary': 0x1E40AF,
         'secondary': 0x6B7280,
@@ -19,298 +43,388 @@ class MarketplaceEmbeds:
         'neutral': 0x6B7280
     }
 
-    def create_setup_embed(self) -> discord.Embed:
-        """Create the setup embed for marketplace initialization."""
-        embed = discord.Embed(
-            title="🏗️ Marketplace Setup",
-            description="Click the button below to set up marketplace channels for your server.",
-            color=self.COLORS['primary']
-        )
+    # Colours used by per-call builders, resolved once when the class is created
+    WARNING_COLOR: Final = COLORS['warning']
+    SUCCESS_COLOR: Final = COLORS['success']
+    ERROR_COLOR: Final = COLORS['error']
+
+    # Per-type styling, indexed by "is WTS" so one comparison picks both
+    TYPE_COLORS = (COLORS['wtb'], COLORS['wts'])
+    TYPE_EMOJIS = ("🔹", "🔸")
+
+    # Fixed embed content, built once and copied per call
+    SETUP_EMBED_TEMPLATE = {
+        'type': 'rich',
+        'title': "🏗️ Marketplace Setup",
+        'description': "Click the button below to set up marketplace channels for your server.",
+        'color': COLORS['primary'],
+        'fields': [
+            {
+                'name': "What happens when you set up?",
+                'value': "• Creates WTS and WTB categories\n• Sets up channels for each zone\n• Configures persistent marketplace messages",
+                'inline': False
+            }
+        ],
+        'footer': {'text': "This will create channels and categories in your server"}
+    }
 
-        embed.add_field(
-            name="What happens when you set up?",
-            value="• Creates WTS and WTB categories\n• Sets up channels for each zone\n• Configures persistent marketplace messages",
-            inline=False
-        )
+    ADMIN_EMBED_TEMPLATE = {
+        'type': 'rich',
+        'title': "⚙️ Marketplace Admin Panel",
+        'description': "Marketplace management options for administrators.",
+        'color': COLORS['secondary'],
+        'fields': [
+            {
+                'name': "Available Commands",
+                'value': "• Setup marketplace channels\n• View marketplace statistics\n• Manage listings and users",
+                'inline': False
+            }
+        ]
+    }
 
-        embed.set_footer(text="This will create channels and categories in your server")
-        return embed
+    RATING_EMBED_TEMPLATE = {
+        'type': 'rich',
+        'title': "⭐ Rate Your Trade Experience",
+        'description': "Please rate your trading experience with this seller:",
+        'color': COLORS['primary'],
+        'footer': {'text': "Your rating helps build trust in the community"}
+    }
 
-    def create_admin_embed(self) -> discord.Embed:
-        """Create admin panel embed."""
-        embed = discord.Embed(
-            title="⚙️ Marketplace Admin Panel",
-            description="Marketplace management options for administrators.",
-            color=self.COLORS['secondary']
-        )
+    RATING_SCALE_FIELD = {
+        'name': "Rating Scale",
+        'value': "⭐ 1 - Poor\n⭐⭐ 2 - Fair\n⭐⭐⭐ 3 - Good\n⭐⭐⭐⭐ 4 - Very Good\n⭐⭐⭐⭐⭐ 5 - Excellent",
+        'inline': False
+    }
 
-        embed.add_field(
-            name="Available Commands",
-            value="• Setup marketplace channels\n• View marketplace statistics\n• Manage listings and users",
-            inline=False
-        )
+    @staticmethod
+    def _embed_from_template(template: Dict[str, Any]) -> discord.Embed:
+        """Build an embed from a template without sharing its mutable parts."""
+        # Embed.from_dict keeps references to the nested data. Only the fields
+        # are edited in place (set_field_at), so just those are copied; the
+        # footer dict is always replaced wholesale by set_footer
+        payload = dict(template)
+        if 'fields' in payload:
+            payload['fields'] = [dict(field) for field in payload['fields']]
+        return discord.Embed.from_dict(payload)
 
-        return embed
+    def create_setup_embed(self) -> discord.Embed:
+        """Create the setup embed for marketplace initialization."""
+        return self._embed_from_template(self.SETUP_EMBED_TEMPLATE)
 
-    def create_marketplace_embed(self, listing_type: str, zone: str, listings: List[Dict[str, Any]], page: int = 0) -> discord.Embed:
-        """Create marketplace embed with pagination."""
+    def create_admin_embed(self) -> discord.Embed:
+        """Create admin panel embed."""
+        return self._embed_from_template(self.ADMIN_EMBED_TEMPLATE)
+
+    # Reputation bars for each whole-star average (0-5)
+    STAR_BARS = tuple("⭐" * i + "☆" * (5 - i) for i in range(6))
+
+    # Filled stars only, for ratings shown without the empty remainder
+    STAR_RUNS = tuple("⭐" * i for i in range(6))
+
+    @classmethod
+    def star_bar(cls, average) -> str:
+        """Get the five-star bar for a reputation average."""
+        return cls.STAR_BARS[min(5, max(0, int(average)))]
+
+    @classmethod
+    def star_run(cls, rating) -> str:
+        """Get the filled stars for a rating or average."""
+        return cls.STAR_RUNS[min(5, max(0, int(rating)))]
+
+    # Marketplace pagination and WTS field layout
+    ITEMS_PER_PAGE = 10
+    MAX_ITEMS_PER_FIELD = 4
+    # Indexed by "count is one"
+    ITEM_NOUNS = ("items", "item")
+    WTS_LISTING_SEPARATOR = "\n· · ─ ·✶· ─ · ·\n"
+    # Items listed by name in the join-queue embed
+    QUEUE_PREVIEW_LIMIT = 10
+    # Listings without a time sort after every scheduled one
+    UNSCHEDULED_SORT_TIME = datetime.max.replace(tzinfo=timezone.utc)
+
+    @classmethod
+    def _listing_sort_key(cls, listing: Dict[str, Any]) -> datetime:
+        """Sort key placing listings by scheduled time, unscheduled last."""
+        return listing.get('scheduled_time') or cls.UNSCHEDULED_SORT_TIME
+
+    @classmethod
+    @lru_cache(maxsize=64)
+    def _marketplace_heading(cls, listing_type_upper: str, zone: str) -> Tuple[str, str, int]:
+        """Get the title, display zone and colour for a marketplace type and zone."""
+        zone_title = zone.title()
+        is_wts = listing_type_upper == 'WTS'
+        title = f"{cls.TYPE_EMOJIS[is_wts]} {listing_type_upper} - {zone_title}"
+        return title, zone_title, cls.TYPE_COLORS[is_wts]
+
+    @classmethod
+    @lru_cache(maxsize=64)
+    def _empty_marketplace_template(cls, listing_type_upper: str, zone: str) -> Dict[str, Any]:
+        """Build the empty-zone marketplace embed payload for a type and zone."""
+        title, zone_title, color = cls._marketplace_heading(listing_type_upper, zone)
+        return {
+            'type': 'rich',
+            'title': title,
+            'description': f"No active {listing_type_upper} listings in {zone_title}",
+            'color': color,
+            'fields': [
+                {
+                    'name': "📝 How to List",
+                    'value': f"Use the **Add {listing_type_upper}** button below to create a listing!",
+                    'inline': False
+                }
+            ]
+        }
+
+    def create_marketplace_embed(self, listing_type: str, zone: str, listings: List[Dict[str, Any]], page: int = 0,
+                                 now: Optional[datetime] = None) -> discord.Embed:
+        """Create marketplace embed with pagination, stamped with now (defaults to the current time)."""
         try:
-            # Sort listings by scheduled time (ascending - soonest first)
-            def sort_key(listing):
-                scheduled_time = listing.get('scheduled_time')
-                if scheduled_time is None:
-                    # Put listings without time at the end
-                    return datetime.max.replace(tzinfo=timezone.utc)
-                return scheduled_time
-            
-            sorted_listings = sorted(listings, key=sort_key)
-            
+            if now is None:
+                now = datetime.now(timezone.utc)
+            listing_type_upper = listing_type.upper()
+
             # Configuration
-            items_per_page = 10
+            items_per_page = self.ITEMS_PER_PAGE
             start_idx = page * items_per_page
             end_idx = start_idx + items_per_page
-            page_listings = sorted_listings[start_idx:end_idx]
-
-            # Color and emoji based on type
-            color = self.COLORS['wts'] if listing_type.upper() == 'WTS' else self.COLORS['wtb']
-            type_emoji = "🔸" if listing_type.upper() == 'WTS' else "🔹"
-
-            # Create embed
-            title = f"{type_emoji} {listing_type.upper()} - {zone.title()}"
-            embed = discord.Embed(
-                title=title,
-                color=color,
-                timestamp=datetime.now(timezone.utc)
-            )
-
-            if not page_listings:
-                embed.description = f"No active {listing_type.upper()} listings in {zone.title()}"
-                embed.add_field(
-                    name="📝 How to List",
-                    value=f"Use the **Add {listing_type.upper()}** button below to create a listing!",
-                    inline=False
-                )
+            total_listings = len(listings)
+            total_pages = max(1, (total_listings + items_per_page - 1) // items_per_page)
+            footer_text = f"Page {page + 1}/{total_pages} • {total_listings} total listings"
+
+            # Empty zones (and pages past the end) render the same payload every time
+            if start_idx >= total_listings:
+                embed = self._embed_from_template(self._empty_marketplace_template(listing_type_upper, zone))
+                embed.timestamp = now
+                embed.set_footer(text=footer_text)
+                return embed
+
+            # Select this page by scheduled time (ascending - soonest first);
+            # nsmallest only orders the listings up to the end of the page, and
+            # earlier pages are dropped in place rather than copied out
+            page_listings = heapq.nsmallest(end_idx, listings, key=self._listing_sort_key)
+            del page_listings[:start_idx]
+
+            # Title and colour are fixed per type and zone, so they are cached
+            title, _, color = self._marketplace_heading(listing_type_upper, zone)
+
+            # Build the fields for this page's listing type
+            if listing_type_upper == 'WTS':
+                fields = self._build_wts_fields(page_listings)
             else:
-                if listing_type.upper() == "WTS":
-                    # Group WTS listings by monster (subcategory)
-                    grouped_listings = {}
-                    for listing in page_listings:
-                        monster = listing['subcategory']
-                        if monster not in grouped_listings:
-                            grouped_listings[monster] = []
-                        grouped_listings[monster].append(listing)
-
-                    # Create fields for each monster group with item limits
-                    for monster, monster_listings in grouped_listings.items():
-                        # Split monster listings into chunks of 4 items max
-                        max_items_per_field = 4
-                        chunks = [monster_listings[i:i + max_items_per_field] 
-                                for i in range(0, len(monster_listings), max_items_per_field)]
-                        
-                        for chunk_index, chunk in enumerate(chunks):
-                            # Create field name based on chunk
-                            if len(chunks) == 1:
-                                # Single chunk - show total count
-                                field_name = f"📂 {monster} ({len(monster_listings)} item{'s' if len(monster_listings) > 1 else ''})"
-                            else:
-                                # Multiple chunks - show part number
-                                if chunk_index == 0:
-                                    field_name = f"📂 {monster} ({len(chunk)} item{'s' if len(chunk) > 1 else ''})"
-                                else:
-                                    field_name = f"📂 {monster} (part {chunk_index + 1}) – ({len(chunk)} item{'s' if len(chunk) > 1 else ''})"
-                            
-                            # Build the field value for this chunk
-                            field_parts = []
-                            for listing in chunk:
-                                # Format timestamp
-                                time_str = "No time set"
-                                if listing.get('scheduled_time'):
-                                    timestamp = int(listing['scheduled_time'].timestamp())
-                                    time_str = f"<t:{timestamp}:f> (<t:{timestamp}:R>)"
-
-                                # Format queue information
-                                queue_str = "No queue"
-                                if 'queues' in listing and listing['queues']:
-                                    queue_users = []
-                                    for item_name, users in listing['queues'].items():
-                                        for user_id in users:
-                                            queue_users.append(f"<@{user_id}>")
-                                    if queue_users:
-                                        queue_str = " • ".join(queue_users)
-
-                                # Notes - truncate if too long
-                                notes_str = listing.get('notes', '').strip() or "No notes."
-                                if len(notes_str) > 100:
-                                    notes_str = notes_str[:97] + "..."
-
-                                # Format this item
-                                item_text = (
-                                    f"> 📦 Item: \n"
-                                    f"> ╰┈➤ {listing['item']} by <@{listing['user_id']}>\n"
-                                    f"> ⏰ Time: {time_str}\n"
-                                    f"> 📝 Notes: {notes_str}\n"
-                                    f"> 👥 Queue: {queue_str}"
-                                )
-                                field_parts.append(item_text)
-
-                            # Join items in this chunk with separator
-                            field_value = "\n· · ─ ·✶· ─ · ·\n".join(field_parts)
-                            
-                            # Safety check - if field is still too long, truncate
-                            if len(field_value) > 1020:
-                                field_value = field_value[:1017] + "..."
-                            
-                            embed.add_field(
-                                name=field_name,
-                                value=field_value,
-                                inline=False
-                            )
-                else:
-                    # WTB format (unchanged) - process individually
-                    for i, listing in enumerate(page_listings, start_idx + 1):
-                        # Format timestamp
-                        time_str = "No time set"
-                        if listing.get('scheduled_time'):
-                            timestamp = int(listing['scheduled_time'].timestamp())
-                            time_str = f"<t:{timestamp}:f> (<t:{timestamp}:R>)"
-
-                        # Format reputation
-                        rep_avg = listing.get('reputation_avg', 0.0)
-                        if isinstance(rep_avg, str):
-                            rep_avg = float(rep_avg) if rep_avg != 'None' else 0.0
-
-                        stars = "⭐" * int(rep_avg) + "☆" * (5 - int(rep_avg))
-                        reputation_str = f" {stars}" if rep_avg > 0 else ""
-
-                        # Format field
-                        field_name = f"{i}. {listing['subcategory']} ({listing['quantity']}x)"
-                        field_value = (
-                            f"**Item:** {listing['item']}\n"
-                            f"**Buyer:** <@{listing['user_id']}>{reputation_str}\n"
-                            f"**Time:** {time_str}"
-                        )
-
-                        if listing.get('notes'):
-                            field_value += f"\n**Notes:** {listing['notes']}"
-
-                        embed.add_field(
-                            name=field_name,
-                            value=field_value,
-                            inline=False
-                        )
-
-            # Add pagination info
-            total_pages = max(1, (len(sorted_listings) + items_per_page - 1) // items_per_page)
-            embed.set_footer(text=f"Page {page + 1}/{total_pages} • {len(sorted_listings)} total listings")
-
+                fields = self._build_wtb_fields(page_listings, start_idx + 1)
+
+            # Embed payload with pagination info, handed to Embed.from_dict once
+            embed = discord.Embed.from_dict({
+                'type': 'rich',
+                'title': title,
+                'color': color,
+                'fields': fields,
+                'footer': {'text': footer_text}
+            })
+            embed.timestamp = now
             return embed
 
         except Exception as e:
             logger.error(f"Error creating marketplace embed: {e}")
             return self.create_error_embed("Failed to create marketplace display")
 
-    def create_listing_confirmation_embed(self, listing_data: Dict[str, Any]) -> discord.Embed:
-        """Create confirmation embed for new listing."""
-        color = self.COLORS['wts'] if listing_data['listing_type'] == 'WTS' else self.COLORS['wtb']
-        emoji = "🔸" if listing_data['listing_type'] == 'WTS' else "🔹"
-
-        embed = discord.Embed(
-            title=f"{emoji} Listing Created",
-            description=f"Your {listing_data['listing_type']} listing has been created successfully!",
-            color=color
-        )
-
-        embed.add_field(name="Zone", value=listing_data['zone'].title(), inline=True)
-        embed.add_field(name="Item", value=listing_data['item'], inline=True)
-        embed.add_field(name="Quantity", value=str(listing_data.get('quantity', 1)), inline=True)
-
-        if listing_data.get('scheduled_time'):
-            timestamp = int(listing_data['scheduled_time'].timestamp())
-            embed.add_field(
-                name="Scheduled Time", 
-                value=f"<t:{timestamp}:f> (<t:{timestamp}:R>)", 
-                inline=False
+    def _build_wts_fields(self, page_listings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Build WTS marketplace fields, grouped by monster."""
+        fields = []
+        # Row formatting helpers as locals for the per-listing loop
+        mention, format_time, separator = format_mention, format_scheduled_time, self.WTS_LISTING_SEPARATOR
+
+        # Group WTS listings by monster (subcategory)
+        grouped_listings = defaultdict(list)
+        for listing in page_listings:
+            grouped_listings[listing['subcategory']].append(listing)
+
+        # Create fields for each monster group with item limits
+        for monster, monster_listings in grouped_listings.items():
+            # Split monster listings into chunks of 4 items max
+            max_items_per_field = self.MAX_ITEMS_PER_FIELD
+            chunks = [monster_listings[i:i + max_items_per_field] 
+                    for i in range(0, len(monster_listings), max_items_per_field)]
+            
+            for chunk_index, chunk in enumerate(chunks):
+                # Create field name based on chunk; a lone chunk holds every
+                # listing, so its size is also the group total
+                chunk_size = len(chunk)
+                item_noun = self.ITEM_NOUNS[chunk_size == 1]
+                if chunk_index == 0:
+                    field_name = f"📂 {monster} ({chunk_size} {item_noun})"
+                else:
+                    # Later chunks - show part number
+                    field_name = f"📂 {monster} (part {chunk_index + 1}) – ({chunk_size} {item_noun})"
+                
+                # Build the field value for this chunk
+                field_parts = []
+                for listing in chunk:
+                    # Read each listing field once
+                    scheduled_time = listing.get('scheduled_time')
+                    queues = listing.get('queues')
+
+                    # Format timestamp
+                    time_str = format_time(scheduled_time) if scheduled_time else "No time set"
+
+                    # Format queue information; empty queues fall back to the default
+                    queue_str = (
+                        queues and " • ".join(map(mention, chain.from_iterable(queues.values())))
+                    ) or "No queue"
+
+                    # Notes - truncate if too long; NULL notes read as None, not ''
+                    notes = listing.get('notes')
+                    notes_str = (notes.strip() if notes else "") or "No notes."
+                    if len(notes_str) > 100:
+                        notes_str = notes_str[:97] + "..."
+
+                    # Format this item
+                    item_text = (
+                        f"> 📦 Item: \n"
+                        f"> ╰┈➤ {listing['item']} by {mention(listing['user_id'])}\n"
+                        f"> ⏰ Time: {time_str}\n"
+                        f"> 📝 Notes: {notes_str}\n"
+                        f"> 👥 Queue: {queue_str}"
+                    )
+                    field_parts.append(item_text)
+
+                # Join items in this chunk with separator
+                field_value = separator.join(field_parts)
+                
+                # Safety check - if field is still too long, truncate
+                if len(field_value) > 1020:
+                    field_value = field_value[:1017] + "..."
+                
+                fields.append({'name': field_name, 'value': field_value, 'inline': False})
+
+        return fields
+
+    def _build_wtb_fields(self, page_listings: List[Dict[str, Any]], start_number: int) -> List[Dict[str, Any]]:
+        """Build WTB marketplace fields, one per listing numbered from start_number."""
+        fields = []
+        for i, listing in enumerate(page_listings, start_number):
+            # Read each listing field once
+            scheduled_time = listing.get('scheduled_time')
+            notes = listing.get('notes')
+
+            # Format timestamp
+            time_str = format_scheduled_time(scheduled_time) if scheduled_time else "No time set"
+
+            # Format reputation
+            # Converted once; NULL (no users row) and 'None' count as unrated
+            rep = listing.get('reputation_avg')
+            rep_avg = float(rep) if rep and rep != 'None' else 0.0
+
+            reputation_str = f" {self.star_bar(rep_avg)}" if rep_avg > 0 else ""
+
+            # Format field
+            field_name = f"{i}. {listing['subcategory']} ({listing['quantity']}x)"
+            notes_str = f"\n**Notes:** {notes}" if notes else ""
+            field_value = (
+                f"**Item:** {listing['item']}\n"
+                f"**Buyer:** {format_mention(listing['user_id'])}{reputation_str}\n"
+                f"**Time:** {time_str}{notes_str}"
             )
 
-        if listing_data.get('notes'):
-            embed.add_field(name="Notes", value=listing_data['notes'], inline=False)
+            fields.append({'name': field_name, 'value': field_value, 'inline': False})
 
-        embed.set_footer(text="Your listing will appear in the marketplace channel")
-        return embed
+        return fields
+
+    def create_listing_confirmation_embed(self, listing_data: Dict[str, Any]) -> discord.Embed:
+        """Create confirmation embed for new listing."""
+        is_wts = listing_data['listing_type'] == 'WTS'
+        color = self.TYPE_COLORS[is_wts]
+        emoji = self.TYPE_EMOJIS[is_wts]
+
+        fields = [
+            {'name': "Zone", 'value': listing_data['zone'].title(), 'inline': True},
+            {'name': "Item", 'value': listing_data['item'], 'inline': True},
+            {'name': "Quantity", 'value': str(listing_data.get('quantity', 1)), 'inline': True}
+        ]
+
+        scheduled_time = listing_data.get('scheduled_time')
+        if scheduled_time:
+            fields.append({'name': "Scheduled Time", 'value': format_scheduled_time(scheduled_time), 'inline': False})
+
+        notes = listing_data.get('notes')
+        if notes:
+            fields.append({'name': "Notes", 'value': notes, 'inline': False})
+
+        return discord.Embed.from_dict({
+            'type': 'rich',
+            'title': f"{emoji} Listing Created",
+            'description': f"Your {listing_data['listing_type']} listing has been created successfully!",
+            'color': color,
+            'fields': fields,
+            'footer': {'text': "Your listing will appear in the marketplace channel"}
+        })
 
     def create_queue_embed(self, zone: str, items: List[str]) -> discord.Embed:
         """Create embed for queue selection."""
-        embed = discord.Embed(
-            title="🔥 Join Queue",
-            description=f"Select an item to queue for in {zone.title()}:",
-            color=0xFF6B6B
-        )
+        zone_title = zone.title()
 
         if not items:
-            embed.add_field(
-                name="No Items Available",
-                value=f"No items are currently listed for sale in {zone.title()}",
-                inline=False
-            )
+            field = {
+                'name': "No Items Available",
+                'value': f"No items are currently listed for sale in {zone_title}",
+                'inline': False
+            }
         else:
-            items_text = "\n".join([f"• {item}" for item in items[:10]])  # Show first 10
-            if len(items) > 10:
-                items_text += f"\n... and {len(items) - 10} more"
-
-            embed.add_field(
-                name="Available Items",
-                value=items_text,
-                inline=False
-            )
-
-        return embed
+            # Show the first few, with the overflow count in the same string
+            preview_limit = self.QUEUE_PREVIEW_LIMIT
+            hidden_count = len(items) - preview_limit
+            more_text = f"\n... and {hidden_count} more" if hidden_count > 0 else ""
+            items_text = "\n".join([f"• {item}" for item in islice(items, preview_limit)]) + more_text
+            field = {'name': "Available Items", 'value': items_text, 'inline': False}
+
+        return discord.Embed.from_dict({
+            'type': 'rich',
+            'title': "🔥 Join Queue",
+            'description': f"Select an item to queue for in {zone_title}:",
+            'color': 0xFF6B6B,
+            'fields': [field]
+        })
 
     def create_notification_embed(self, listing_data: Dict[str, Any], queue_users: List[int]) -> discord.Embed:
         """Create notification embed for scheduled trade time."""
-        embed = discord.Embed(
-            title="⏰ Trade Time Notification",
-            description="It's time for your scheduled trade!",
-            color=self.COLORS['warning']
-        )
-
-        embed.add_field(name="Item", value=listing_data['item'], inline=True)
-        embed.add_field(name="Zone", value=listing_data['zone'].title(), inline=True)
-        embed.add_field(name="Seller", value=f"<@{listing_data['user_id']}>", inline=True)
+        fields = [
+            {'name': "Item", 'value': listing_data['item'], 'inline': True},
+            {'name': "Zone", 'value': listing_data['zone'].title(), 'inline': True},
+            {'name': "Seller", 'value': format_mention(listing_data['user_id']), 'inline': True}
+        ]
 
         if queue_users:
-            queue_mentions = ', '.join([f"<@{user_id}>" for user_id in queue_users])
-            embed.add_field(name="Queued Buyers", value=queue_mentions, inline=False)
-
-        embed.set_footer(text="Please coordinate your trade in-game")
-        return embed
+            queue_mentions = ', '.join(map(format_mention, queue_users))
+            fields.append({'name': "Queued Buyers", 'value': queue_mentions, 'inline': False})
+
+        return discord.Embed.from_dict({
+            'type': 'rich',
+            'title': "⏰ Trade Time Notification",
+            'description': "It's time for your scheduled trade!",
+            'color': self.WARNING_COLOR,
+            'fields': fields,
+            'footer': {'text': "Please coordinate your trade in-game"}
+        })
 
     def create_rating_embed(self, listing_data: Dict[str, Any]) -> discord.Embed:
         """Create rating embed for post-trade feedback."""
-        embed = discord.Embed(
-            title="⭐ Rate Your Trade Experience",
-            description="Please rate your trading experience with this seller:",
-            color=self.COLORS['primary']
-        )
-
-        embed.add_field(name="Item", value=listing_data['item'], inline=True)
-        embed.add_field(name="Zone", value=listing_data['zone'].title(), inline=True)
-        embed.add_field(name="Seller", value=f"<@{listing_data['user_id']}>", inline=True)
-
-        embed.add_field(
-            name="Rating Scale",
-            value="⭐ 1 - Poor\n⭐⭐ 2 - Fair\n⭐⭐⭐ 3 - Good\n⭐⭐⭐⭐ 4 - Very Good\n⭐⭐⭐⭐⭐ 5 - Excellent",
-            inline=False
-        )
-
-        embed.set_footer(text="Your rating helps build trust in the community")
-        return embed
+        # Only the trade details vary; the rest comes from the template
+        return discord.Embed.from_dict({
+            **self.RATING_EMBED_TEMPLATE,
+            'fields': [
+                {'name': "Item", 'value': listing_data['item'], 'inline': True},
+                {'name': "Zone", 'value': listing_data['zone'].title(), 'inline': True},
+                {'name': "Seller", 'value': format_mention(listing_data['user_id']), 'inline': True},
+                dict(self.RATING_SCALE_FIELD)
+            ]
+        })
 
     def create_setup_success_embed(self, channels_created: int) -> discord.Embed:
         """Create success embed for marketplace setup."""
         embed = discord.Embed(
             title="✅ Marketplace Setup Complete",
             description=f"Successfully created {channels_created} marketplace channels!",
-            color=self.COLORS['success']
+            color=self.SUCCESS_COLOR
         )
 
         embed.add_field(
@@ -327,7 +441,7 @@ class MarketplaceEmbeds:
         embed = discord.Embed(
             title="❌ Error",
             description=message,
-            color=self.COLORS['error']
+            color=self.ERROR_COLOR
         )
 
         embed.set_footer(text="Please try again or contact an administrator")
@@ -4,7 +4,11 @@ from typing import List, Dict, Any, Optional
 import logging
 from datetime import datetime, timezone, timedelta
 import asyncio
+import re
 import pytz
+from itertools import islice
+
+from bot.ui.embeds import MarketplaceEmbeds, format_relative_time
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +54,9 @@ class ListingModal(discord.ui.Modal, title="Create Listing"):
     async def on_submit(self, interaction: discord.Interaction):
         """Handle modal submission."""
         try:
+            # Acknowledge right away so the database work is not racing the interaction deadline
+            await interaction.response.defer(ephemeral=True, thinking=True)
+
             # Parse quantity
             try:
                 quantity_val = int(self.quantity.value) if self.quantity.value else 1
@@ -74,7 +81,6 @@ class ListingModal(discord.ui.Modal, title="Create Listing"):
 
             if listing_id:
                 # Create confirmation embed
-                from bot.ui.embeds import MarketplaceEmbeds
                 embeds = MarketplaceEmbeds()
 
                 listing_data = {
@@ -88,12 +94,12 @@ class ListingModal(discord.ui.Modal, title="Create Listing"):
 
                 embed = embeds.create_listing_confirmation_embed(listing_data)
 
-                await interaction.response.send_message(embed=embed, ephemeral=True)
+                await interaction.followup.send(embed=embed, ephemeral=True)
 
                 # Refresh marketplace embed
                 asyncio.create_task(self.refresh_marketplace_embed(interaction))
             else:
-                await interaction.response.send_message(
+                await interaction.followup.send(
                     "❌ Failed to create listing. Please try again.",
                     ephemeral=True
                 )
@@ -101,95 +107,16 @@ class ListingModal(discord.ui.Modal, title="Create Listing"):
         except Exception as e:
             logger.error(f"Error in listing modal submission: {e}")
             try:
-                if not interaction.response.is_done():
-                    await interaction.response.send_message(
-                        "❌ An error occurred while creating the listing",
-                        ephemeral=True
-                    )
+                await interaction.followup.send(
+                    "❌ An error occurred while creating the listing",
+                    ephemeral=True
+                )
             except:
                 pass
 
     async def refresh_marketplace_embed(self, interaction: discord.Interaction):
         """Refresh the marketplace embed after creating a listing."""
-        try:
-            # Import here to avoid circular imports
-            from bot.ui.views import MarketplaceView
-
-            # Get the marketplace channel for this listing type and zone
-            channel_info = await self.bot.db_manager.execute_query(
-                "SELECT channel_id, message_id FROM marketplace_channels WHERE guild_id = $1 AND listing_type = $2 AND zone = $3",
-                interaction.guild.id, self.listing_type, self.zone
-            )
-
-            if channel_info:
-                channel_data = channel_info[0]
-                channel = interaction.guild.get_channel(channel_data['channel_id'])
-
-                if channel:
-                    # Get updated listings with queue data
-                    view = MarketplaceView(self.bot, self.listing_type, self.zone, 0)
-                    listings = await view.get_listings_with_queues(interaction.guild.id)
-
-                    # Create updated embed
-                    from bot.ui.embeds import MarketplaceEmbeds
-                    embeds = MarketplaceEmbeds()
-                    embed = embeds.create_marketplace_embed(
-                        self.listing_type, self.zone, listings, 0
-                    )
-
-                    # Create new view
-                    new_view = MarketplaceView(self.bot, self.listing_type, self.zone, 0)
-
-                    # Update the message
-                    message_id = channel_data.get('message_id')
-                    if message_id:
-                        try:
-                            message = await channel.fetch_message(message_id)
-                            await message.edit(embed=embed, view=new_view)
-                            logger.info(f"Successfully refreshed marketplace embed with {len(listings)} listings")
-                        except discord.NotFound:
-                            logger.warning(f"Message {message_id} not found, searching for message...")
-                            # If message not found by ID, search for it
-                            async for msg in channel.history(limit=50):
-                                if (msg.author == self.bot.user and 
-                                    msg.embeds and 
-                                    msg.embeds[0].title and 
-                                    self.listing_type.upper() in msg.embeds[0].title and
-                                    self.zone.lower() in msg.embeds[0].title.lower()):
-                                    await msg.edit(embed=embed, view=new_view)
-                                    # Update stored message ID
-                                    await self.bot.db_manager.execute_command(
-                                        "UPDATE marketplace_channels SET message_id = $1 WHERE channel_id = $2",
-                                        msg.id, channel.id
-                                    )
-                                    logger.info(f"Found and updated marketplace message, new ID: {msg.id}")
-                                    break
-                    else:
-                        logger.warning(f"No message_id stored for channel {channel.id}, searching...")
-                        # No stored message ID, search for the message
-                        async for msg in channel.history(limit=50):
-                            if (msg.author == self.bot.user and 
-                                msg.embeds and 
-                                msg.embeds[0].title and 
-                                self.listing_type.upper() in msg.embeds[0].title and
-                                self.zone.lower() in msg.embeds[0].title.lower()):
-                                await msg.edit(embed=embed, view=new_view)
-                                # Store the message ID for future use
-                                await self.bot.db_manager.execute_command(
-                                    "UPDATE marketplace_channels SET message_id = $1 WHERE channel_id = $2",
-                                    msg.id, channel.id
-                                )
-                                logger.info(f"Found and updated marketplace message, stored ID: {msg.id}")
-                                break
-                else:
-                    logger.warning(f"Channel {channel_data['channel_id']} not found")
-            else:
-                logger.warning(f"No channel info found for {self.listing_type} in {self.zone}")
-
-        except Exception as e:
-            logger.error(f"Error refreshing marketplace embed: {e}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
+        await self.bot.marketplace_service.refresh_zone_embed(interaction.guild, self.listing_type, self.zone)
 
 class QuantityNotesModal(discord.ui.Modal, title="Listing Details"):
     """Modal for quantity, notes, and scheduling."""
@@ -218,6 +145,9 @@ class QuantityNotesModal(discord.ui.Modal, title="Listing Details"):
     async def on_submit(self, interaction: discord.Interaction):
         """Handle modal submission."""
         try:
+            # Acknowledge right away so the database work is not racing the interaction deadline
+            await interaction.response.defer(ephemeral=True, thinking=True)
+
             # Parse quantity
             try:
                 quantity_val = int(self.quantity.value) if self.quantity.value else 1
@@ -253,7 +183,7 @@ class QuantityNotesModal(discord.ui.Modal, title="Listing Details"):
                     timezone_button.callback = timezone_callback
                     view.add_item(timezone_button)
 
-                    await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+                    await interaction.followup.send(embed=embed, view=view, ephemeral=True)
                     return
 
                 # Show datetime selection
@@ -271,7 +201,7 @@ class QuantityNotesModal(discord.ui.Modal, title="Listing Details"):
                     color=0x3B82F6
                 )
 
-                await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+                await interaction.followup.send(embed=embed, view=view, ephemeral=True)
                 return
 
             # For WTB listings, proceed without scheduling
@@ -289,7 +219,6 @@ class QuantityNotesModal(discord.ui.Modal, title="Listing Details"):
 
             if listing_id:
                 # Create confirmation embed
-                from bot.ui.embeds import MarketplaceEmbeds
                 embeds = MarketplaceEmbeds()
 
                 listing_data = {
@@ -301,12 +230,12 @@ class QuantityNotesModal(discord.ui.Modal, title="Listing Details"):
 
                 embed = embeds.create_listing_confirmation_embed(listing_data)
 
-                await interaction.response.send_message(embed=embed, ephemeral=True)
+                await interaction.followup.send(embed=embed, ephemeral=True)
 
                 # Refresh marketplace embed
                 asyncio.create_task(self.refresh_marketplace_embed(interaction))
             else:
-                await interaction.response.send_message(
+                await interaction.followup.send(
                     "❌ Failed to create listing. Please try again.",
                     ephemeral=True
                 )
@@ -314,95 +243,16 @@ class QuantityNotesModal(discord.ui.Modal, title="Listing Details"):
         except Exception as e:
             logger.error(f"Error in quantity/notes modal submission: {e}")
             try:
-                if not interaction.response.is_done():
-                    await interaction.response.send_message(
-                        "❌ An error occurred while creating the listing",
-                        ephemeral=True
-                    )
+                await interaction.followup.send(
+                    "❌ An error occurred while creating the listing",
+                    ephemeral=True
+                )
             except:
                 pass
 
     async def refresh_marketplace_embed(self, interaction: discord.Interaction):
         """Refresh the marketplace embed after creating a listing."""
-        try:
-            # Import here to avoid circular imports
-            from bot.ui.views import MarketplaceView
-
-            # Get the marketplace channel for this listing type and zone
-            channel_info = await self.bot.db_manager.execute_query(
-                "SELECT channel_id, message_id FROM marketplace_channels WHERE guild_id = $1 AND listing_type = $2 AND zone = $3",
-                interaction.guild.id, self.listing_data['listing_type'], self.listing_data['zone']
-            )
-
-            if channel_info:
-                channel_data = channel_info[0]
-                channel = interaction.guild.get_channel(channel_data['channel_id'])
-
-                if channel:
-                    # Get updated listings with queue data
-                    view = MarketplaceView(self.bot, self.listing_data['listing_type'], self.listing_data['zone'], 0)
-                    listings = await view.get_listings_with_queues(interaction.guild.id)
-
-                    # Create updated embed
-                    from bot.ui.embeds import MarketplaceEmbeds
-                    embeds = MarketplaceEmbeds()
-                    embed = embeds.create_marketplace_embed(
-                        self.listing_data['listing_type'], self.listing_data['zone'], listings, 0
-                    )
-
-                    # Create new view
-                    new_view = MarketplaceView(self.bot, self.listing_data['listing_type'], self.listing_data['zone'], 0)
-
-                    # Update the message
-                    message_id = channel_data.get('message_id')
-                    if message_id:
-                        try:
-                            message = await channel.fetch_message(message_id)
-                            await message.edit(embed=embed, view=new_view)
-                            logger.info(f"Successfully refreshed marketplace embed with {len(listings)} listings")
-                        except discord.NotFound:
-                            logger.warning(f"Message {message_id} not found, searching for message...")
-                            # If message not found by ID, search for it
-                            async for msg in channel.history(limit=50):
-                                if (msg.author == self.bot.user and 
-                                    msg.embeds and 
-                                    msg.embeds[0].title and 
-                                    self.listing_data['listing_type'].upper() in msg.embeds[0].title and
-                                    self.listing_data['zone'].lower() in msg.embeds[0].title.lower()):
-                                    await msg.edit(embed=embed, view=new_view)
-                                    # Update stored message ID
-                                    await self.bot.db_manager.execute_command(
-                                        "UPDATE marketplace_channels SET message_id = $1 WHERE channel_id = $2",
-                                        msg.id, channel.id
-                                    )
-                                    logger.info(f"Found and updated marketplace message, new ID: {msg.id}")
-                                    break
-                    else:
-                        logger.warning(f"No message_id stored for channel {channel.id}, searching...")
-                        # No stored message ID, search for the message
-                        async for msg in channel.history(limit=50):
-                            if (msg.author == self.bot.user and 
-                                msg.embeds and 
-                                msg.embeds[0].title and 
-                                self.listing_data['listing_type'].upper() in msg.embeds[0].title and
-                                self.listing_data['zone'].lower() in msg.embeds[0].title.lower()):
-                                await msg.edit(embed=embed, view=new_view)
-                                # Store the message ID for future use
-                                await self.bot.db_manager.execute_command(
-                                    "UPDATE marketplace_channels SET message_id = $1 WHERE channel_id = $2",
-                                    msg.id, channel.id
-                                )
-                                logger.info(f"Found and updated marketplace message, stored ID: {msg.id}")
-                                break
-                else:
-                    logger.warning(f"Channel {channel_data['channel_id']} not found")
-            else:
-                logger.warning(f"No channel info found for {self.listing_data['listing_type']} in {self.listing_data['zone']}")
-
-        except Exception as e:
-            logger.error(f"Error refreshing marketplace embed: {e}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
+        await self.bot.marketplace_service.refresh_zone_embed(interaction.guild, self.listing_data['listing_type'], self.listing_data['zone'])
 
 class QueueSelectView(discord.ui.View):
     """View for selecting items to queue for."""
@@ -515,73 +365,7 @@ class QueueSelectView(discord.ui.View):
 
     async def refresh_marketplace_embed(self, interaction: discord.Interaction):
         """Refresh the marketplace embed in the channel."""
-        try:
-            # Get the specific marketplace channel for WTS in this zone
-            channel_info = await self.bot.db_manager.execute_query(
-                "SELECT channel_id, message_id FROM marketplace_channels WHERE guild_id = $1 AND listing_type = $2 AND zone = $3",
-                interaction.guild.id, "WTS", self.zone
-            )
-
-            if not channel_info:
-                logger.warning(f"No marketplace channel found for WTS in {self.zone}")
-                return
-
-            channel_data = channel_info[0]
-            channel = interaction.guild.get_channel(channel_data['channel_id'])
-
-            if not channel:
-                logger.warning(f"Channel {channel_data['channel_id']} not found")
-                return
-
-            # Get updated listings with queue data
-            listings = await self.bot.db_manager.get_zone_listings(
-                interaction.guild.id, "WTS", self.zone
-            )
-
-            # Add queue data to each listing
-            for listing in listings:
-                queues = await self.bot.db_manager.get_listing_queues(listing['id'])
-                listing['queues'] = queues
-
-            # Create updated embed
-            from bot.ui.embeds import MarketplaceEmbeds
-            embeds = MarketplaceEmbeds()
-            embed = embeds.create_marketplace_embed(
-                "WTS", self.zone, listings, 0  # Reset to first page
-            )
-
-            # Create new view
-            from bot.ui.views import MarketplaceView
-            view = MarketplaceView(self.bot, "WTS", self.zone, 0)
-
-            # Try to find and update the marketplace message
-            message_id = channel_data.get('message_id')
-            if message_id:
-                try:
-                    message = await channel.fetch_message(message_id)
-                    await message.edit(embed=embed, view=view)
-                    return
-                except discord.NotFound:
-                    logger.warning(f"Marketplace message {message_id} not found")
-
-            # If message_id doesn't work, search for the message
-            async for message in channel.history(limit=50):
-                if (message.author == self.bot.user and 
-                    message.embeds and 
-                    message.embeds[0].title and 
-                    "WTS" in message.embeds[0].title and
-                    self.zone.lower() in message.embeds[0].title.lower()):
-                    await message.edit(embed=embed, view=view)
-
-                    # Update the stored message_id
-                    await self.bot.db_manager.execute_command(
-                        "UPDATE marketplace_channels SET message_id = $1 WHERE channel_id = $2",
-                        message.id, channel.id
-                    )
-                    break
-
-        except Exception as e:
-            logger.error(f"Error refreshing marketplace embed: {e}")
+        await self.bot.marketplace_service.refresh_zone_embed(interaction.guild, "WTS", self.zone)
 
 class SellerSelectView(discord.ui.View):
     """View for selecting which seller to queue with."""
@@ -594,12 +378,9 @@ class SellerSelectView(discord.ui.View):
 
         # Create dropdown with sellers
         options = []
-        for seller in sellers[:25]:  # Discord limit
+        for seller in islice(sellers, 25):  # Discord limit
             scheduled_time = seller.get('scheduled_time')
-            time_str = "No time set"
-            if scheduled_time:
-                timestamp = int(scheduled_time.timestamp())
-                time_str = f"<t:{timestamp}:R>"
+            time_str = format_relative_time(scheduled_time) if scheduled_time else "No time set"
 
             # Get user from bot to get proper display name
             user = self.bot.get_user(seller['user_id'])
@@ -666,37 +447,7 @@ class SellerSelectView(discord.ui.View):
 
     async def refresh_marketplace_embed(self, interaction: discord.Interaction):
         """Refresh marketplace embed after queue change."""
-        try:
-            from bot.ui.views import MarketplaceView
-
-            channel_info = await self.bot.db_manager.execute_query(
-                "SELECT channel_id, message_id FROM marketplace_channels WHERE guild_id = $1 AND listing_type = 'WTS' AND zone = $2",
-                interaction.guild.id, self.zone
-            )
-
-            if channel_info:
-                channel_data = channel_info[0]
-                channel = interaction.guild.get_channel(channel_data['channel_id'])
-
-                if channel:
-                    view = MarketplaceView(self.bot, 'WTS', self.zone, 0)
-                    listings = await view.get_listings_with_queues(interaction.guild.id)
-
-                    from bot.ui.embeds import MarketplaceEmbeds
-                    embeds = MarketplaceEmbeds()
-                    embed = embeds.create_marketplace_embed('WTS', self.zone, listings, 0)
-                    new_view = MarketplaceView(self.bot, 'WTS', self.zone, 0)
-
-                    message_id = channel_data.get('message_id')
-                    if message_id:
-                        try:
-                            message = await channel.fetch_message(message_id)
-                            await message.edit(embed=embed, view=new_view)
-                        except discord.NotFound:
-                            pass
-
-        except Exception as e:
-            logger.error(f"Error refreshing marketplace embed: {e}")
+        await self.bot.marketplace_service.refresh_zone_embed(interaction.guild, "WTS", self.zone)
 
 class SellerJoinView(discord.ui.View):
     """View for WTB buyers to join existing WTS seller queues."""
@@ -709,12 +460,9 @@ class SellerJoinView(discord.ui.View):
 
         # Create dropdown with sellers
         options = []
-        for seller in sellers[:25]:  # Discord limit
+        for seller in islice(sellers, 25):  # Discord limit
             scheduled_time = seller.get('scheduled_time')
-            time_str = "No time set"
-            if scheduled_time:
-                timestamp = int(scheduled_time.timestamp())
-                time_str = f"<t:{timestamp}:R>"
+            time_str = format_relative_time(scheduled_time) if scheduled_time else "No time set"
 
             # Get user from bot to get proper display name
             user = self.bot.get_user(seller['user_id'])
@@ -800,37 +548,7 @@ class SellerJoinView(discord.ui.View):
 
     async def refresh_marketplace_embed(self, interaction: discord.Interaction):
         """Refresh marketplace embed after queue change."""
-        try:
-            from bot.ui.views import MarketplaceView
-
-            channel_info = await self.bot.db_manager.execute_query(
-                "SELECT channel_id, message_id FROM marketplace_channels WHERE guild_id = $1 AND listing_type = 'WTS' AND zone = $2",
-                interaction.guild.id, self.zone
-            )
-
-            if channel_info:
-                channel_data = channel_info[0]
-                channel = interaction.guild.get_channel(channel_data['channel_id'])
-
-                if channel:
-                    view = MarketplaceView(self.bot, 'WTS', self.zone, 0)
-                    listings = await view.get_listings_with_queues(interaction.guild.id)
-
-                    from bot.ui.embeds import MarketplaceEmbeds
-                    embeds = MarketplaceEmbeds()
-                    embed = embeds.create_marketplace_embed('WTS', self.zone, listings, 0)
-                    new_view = MarketplaceView(self.bot, 'WTS', self.zone, 0)
-
-                    message_id = channel_data.get('message_id')
-                    if message_id:
-                        try:
-                            message = await channel.fetch_message(message_id)
-                            await message.edit(embed=embed, view=new_view)
-                        except discord.NotFound:
-                            pass
-
-        except Exception as e:
-            logger.error(f"Error refreshing marketplace embed: {e}")
+        await self.bot.marketplace_service.refresh_zone_embed(interaction.guild, "WTS", self.zone)
 
 class LeaveQueueView(discord.ui.View):
     """View for leaving queues."""
@@ -842,7 +560,7 @@ class LeaveQueueView(discord.ui.View):
 
         # Create dropdown with user's queue entries
         options = []
-        for queue in user_queues[:25]:  # Discord limit
+        for queue in islice(user_queues, 25):  # Discord limit
             label = f"Leave queue for: {queue['item_name']}"
             if len(label) > 100:
                 label = label[:97] + "..."
@@ -893,37 +611,7 @@ class LeaveQueueView(discord.ui.View):
 
     async def refresh_marketplace_embed(self, interaction: discord.Interaction):
         """Refresh marketplace embed after queue change."""
-        try:
-            from bot.ui.views import MarketplaceView
-
-            channel_info = await self.bot.db_manager.execute_query(
-                "SELECT channel_id, message_id FROM marketplace_channels WHERE guild_id = $1 AND listing_type = 'WTS' AND zone = $2",
-                interaction.guild.id, self.zone
-            )
-
-            if channel_info:
-                channel_data = channel_info[0]
-                channel = interaction.guild.get_channel(channel_data['channel_id'])
-
-                if channel:
-                    view = MarketplaceView(self.bot, 'WTS', self.zone, 0)
-                    listings = await view.get_listings_with_queues(interaction.guild.id)
-
-                    from bot.ui.embeds import MarketplaceEmbeds
-                    embeds = MarketplaceEmbeds()
-                    embed = embeds.create_marketplace_embed('WTS', self.zone, listings, 0)
-                    new_view = MarketplaceView(self.bot, 'WTS', self.zone, 0)
-
-                    message_id = channel_data.get('message_id')
-                    if message_id:
-                        try:
-                            message = await channel.fetch_message(message_id)
-                            await message.edit(embed=embed, view=new_view)
-                        except discord.NotFound:
-                            pass
-
-        except Exception as e:
-            logger.error(f"Error refreshing marketplace embed: {e}")
+        await self.bot.marketplace_service.refresh_zone_embed(interaction.guild, "WTS", self.zone)
 
 class QueueSearchModal(discord.ui.Modal, title="Search Items"):
     """Modal for searching items when there are too many for a dropdown."""
@@ -1081,9 +769,10 @@ class DateTimeSelectView(discord.ui.View):
         # Add date options (today + 14 days)
         date_options = []
         user_tz = pytz.timezone(user_timezone)
+        today = datetime.now(user_tz).date()
 
         for i in range(15):  # 0-14 days ahead
-            date = datetime.now(user_tz).date() + timedelta(days=i)
+            date = today + timedelta(days=i)
             label = date.strftime("%A, %B %d")
             if i == 0:
                 label += " (Today)"
@@ -1093,7 +782,7 @@ class DateTimeSelectView(discord.ui.View):
             date_options.append(
                 discord.SelectOption(
                     label=label,
-                    value=date.strftime("%Y-%m-%d")
+                    value=date.isoformat()
                 )
             )
 
@@ -1161,15 +850,14 @@ class DateTimeSelectView(discord.ui.View):
     async def create_listing(self, interaction: discord.Interaction):
         """Create listing with selected date and time."""
         try:
+            # Acknowledge right away so the database work is not racing the interaction deadline
+            await interaction.response.defer(ephemeral=True, thinking=True)
+
             # Convert user's local time to UTC timestamp
             user_tz = pytz.timezone(self.user_timezone)
 
-            # Parse date and time
-            date_obj = datetime.strptime(self.selected_date, "%Y-%m-%d").date()
-            time_obj = datetime.strptime(self.selected_time, "%H:%M").time()
-
-            # Create naive datetime and localize to user's timezone
-            naive_dt = datetime.combine(date_obj, time_obj)
+            # Parse the ISO date and HH:MM time in one pass into a naive datetime
+            naive_dt = datetime.fromisoformat(f"{self.selected_date}T{self.selected_time}")
 
             # Handle potential DST issues by using localize
             try:
@@ -1206,7 +894,6 @@ class DateTimeSelectView(discord.ui.View):
                 await self.bot.db_manager.create_scheduled_event(listing_id, utc_dt)
 
                 # Create confirmation embed showing both local and UTC times
-                from bot.ui.embeds import MarketplaceEmbeds
                 embeds = MarketplaceEmbeds()
 
                 listing_data = {
@@ -1218,12 +905,12 @@ class DateTimeSelectView(discord.ui.View):
 
                 embed = embeds.create_listing_confirmation_embed(listing_data)
 
-                await interaction.response.send_message(embed=embed, ephemeral=True)
+                await interaction.followup.send(embed=embed, ephemeral=True)
 
                 # Refresh marketplace embed
                 asyncio.create_task(self.refresh_marketplace_embed(interaction))
             else:
-                await interaction.response.send_message(
+                await interaction.followup.send(
                     "❌ Failed to create listing. Please try again.",
                     ephemeral=True
                 )
@@ -1231,99 +918,23 @@ class DateTimeSelectView(discord.ui.View):
         except Exception as e:
             logger.error(f"Error creating listing with datetime: {e}")
             try:
-                if not interaction.response.is_done():
-                    await interaction.response.send_message(
-                        "❌ An error occurred while creating the listing",
-                        ephemeral=True
-                    )
+                await interaction.followup.send(
+                    "❌ An error occurred while creating the listing",
+                    ephemeral=True
+                )
             except:
                 pass
 
     async def refresh_marketplace_embed(self, interaction: discord.Interaction):
         """Refresh the marketplace embed after creating a listing."""
-        try:
-            # Import here to avoid circular imports
-            from bot.ui.views import MarketplaceView
-
-            # Get the marketplace channel for this listing type and zone
-            channel_info = await self.bot.db_manager.execute_query(
-                "SELECT channel_id, message_id FROM marketplace_channels WHERE guild_id = $1 AND listing_type = $2 AND zone = $3",
-                interaction.guild.id, self.listing_data['listing_type'], self.listing_data['zone']
-            )
-
-            if channel_info:
-                channel_data = channel_info[0]
-                channel = interaction.guild.get_channel(channel_data['channel_id'])
-
-                if channel:
-                    # Get updated listings with queue data
-                    view = MarketplaceView(self.bot, self.listing_data['listing_type'], self.listing_data['zone'], 0)
-                    listings = await view.get_listings_with_queues(interaction.guild.id)
-
-                    # Create updated embed
-                    from bot.ui.embeds import MarketplaceEmbeds
-                    embeds = MarketplaceEmbeds()
-                    embed = embeds.create_marketplace_embed(
-                        self.listing_data['listing_type'], self.listing_data['zone'], listings, 0
-                    )
-
-                    # Create new view
-                    new_view = MarketplaceView(self.bot, self.listing_data['listing_type'], self.listing_data['zone'], 0)
-
-                    # Update the message
-                    message_id = channel_data.get('message_id')
-                    if message_id:
-                        try:
-                            message = await channel.fetch_message(message_id)
-                            await message.edit(embed=embed, view=new_view)
-                            logger.info(f"Successfully refreshed marketplace embed with {len(listings)} listings")
-                        except discord.NotFound:
-                            logger.warning(f"Message {message_id} not found, searching for message...")
-                            # If message not found by ID, search for it
-                            async for msg in channel.history(limit=50):
-                                if (msg.author == self.bot.user and 
-                                    msg.embeds and 
-                                    msg.embeds[0].title and 
-                                    self.listing_data['listing_type'].upper() in msg.embeds[0].title and
-                                    self.listing_data['zone'].lower() in msg.embeds[0].title.lower()):
-                                    await msg.edit(embed=embed, view=new_view)
-                                    # Update stored message ID
-                                    await self.bot.db_manager.execute_command(
-                                        "UPDATE marketplace_channels SET message_id = $1 WHERE channel_id = $2",
-                                        msg.id, channel.id
-                                    )
-                                    logger.info(f"Found and updated marketplace message, new ID: {msg.id}")
-                                    break
-                    else:
-                        logger.warning(f"No message_id stored for channel {channel.id}, searching...")
-                        # No stored message ID, search for the message
-                        async for msg in channel.history(limit=50):
-                            if (msg.author == self.bot.user and 
-                                msg.embeds and 
-                                msg.embeds[0].title and 
-                                self.listing_data['listing_type'].upper() in msg.embeds[0].title and
-                                self.listing_data['zone'].lower() in msg.embeds[0].title.lower()):
-                                await msg.edit(embed=embed, view=new_view)
-                                # Store the message ID for future use
-                                await self.bot.db_manager.execute_command(
-                                    "UPDATE marketplace_channels SET message_id = $1 WHERE channel_id = $2",
-                                    msg.id, channel.id
-                                )
-                                logger.info(f"Found and updated marketplace message, stored ID: {msg.id}")
-                                break
-                else:
-                    logger.warning(f"Channel {channel_data['channel_id']} not found")
-            else:
-                logger.warning(f"No channel info found for {self.listing_data['listing_type']} in {self.listing_data['zone']}")
-
-        except Exception as e:
-            logger.error(f"Error refreshing marketplace embed: {e}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
+        await self.bot.marketplace_service.refresh_zone_embed(interaction.guild, self.listing_data['listing_type'], self.listing_data['zone'])
 
 class CustomTimeModal(discord.ui.Modal, title="Enter Custom Time"):
     """Modal for entering custom time in HH:MM format."""
 
+    # 24-hour HH:MM, compiled once for every submission
+    TIME_PATTERN = re.compile(r'^([01]\d|2[0-3]):([0-5]\d)$')
+
     def __init__(self, bot, listing_data: Dict[str, Any], user_timezone: str, selected_date: str):
         super().__init__()
         self.bot = bot
@@ -1345,8 +956,7 @@ class CustomTimeModal(discord.ui.Modal, title="Enter Custom Time"):
             time_str = self.time_input.value.strip()
 
             # Validate time format strictly
-            import re
-            if not re.match(r'^([01]\d|2[0-3]):([0-5]\d)$', time_str):
+            if not self.TIME_PATTERN.match(time_str):
                 await interaction.response.send_message(
                     "❌ Invalid time format. Please use HH:MM in 24-hour format (e.g., 14:30)",
                     ephemeral=True
@@ -1370,15 +980,14 @@ class CustomTimeModal(discord.ui.Modal, title="Enter Custom Time"):
     async def create_listing_with_custom_time(self, interaction: discord.Interaction, time_str: str):
         """Create listing with custom time."""
         try:
+            # Acknowledge right away so the database work is not racing the interaction deadline
+            await interaction.response.defer(ephemeral=True, thinking=True)
+
             # Convert to UTC timestamp
             user_tz = pytz.timezone(self.user_timezone)
 
-            # Parse date and time
-            date_obj = datetime.strptime(self.selected_date, "%Y-%m-%d").date()
-            time_obj = datetime.strptime(time_str, "%H:%M").time()
-
-            # Combine and localize
-            local_dt = user_tz.localize(datetime.combine(date_obj, time_obj))
+            # Parse date and time together, then localize
+            local_dt = user_tz.localize(datetime.fromisoformat(f"{self.selected_date}T{time_str}"))
             utc_dt = local_dt.astimezone(pytz.UTC)
 
             # Create listing in database
@@ -1399,7 +1008,6 @@ class CustomTimeModal(discord.ui.Modal, title="Enter Custom Time"):
                 await self.bot.db_manager.create_scheduled_event(listing_id, utc_dt)
 
                 # Create confirmation embed
-                from bot.ui.embeds import MarketplaceEmbeds
                 embeds = MarketplaceEmbeds()
 
                 listing_data = {
@@ -1409,12 +1017,12 @@ class CustomTimeModal(discord.ui.Modal, title="Enter Custom Time"):
 
                 embed = embeds.create_listing_confirmation_embed(listing_data)
 
-                await interaction.response.send_message(embed=embed, ephemeral=True)
+                await interaction.followup.send(embed=embed, ephemeral=True)
 
                 # Refresh marketplace embed
                 asyncio.create_task(self.refresh_marketplace_embed(interaction))
             else:
-                await interaction.response.send_message(
+                await interaction.followup.send(
                     "❌ Failed to create listing. Please try again.",
                     ephemeral=True
                 )
@@ -1422,92 +1030,13 @@ class CustomTimeModal(discord.ui.Modal, title="Enter Custom Time"):
         except Exception as e:
             logger.error(f"Error creating listing with custom time: {e}")
             try:
-                if not interaction.response.is_done():
-                    await interaction.response.send_message(
-                        "❌ An error occurred while creating the listing",
-                        ephemeral=True
-                    )
+                await interaction.followup.send(
+                    "❌ An error occurred while creating the listing",
+                    ephemeral=True
+                )
             except:
                 pass
 
     async def refresh_marketplace_embed(self, interaction: discord.Interaction):
         """Refresh the marketplace embed after creating a listing."""
-        try:
-            # Import here to avoid circular imports
-            from bot.ui.views import MarketplaceView
-
-            # Get the marketplace channel for this listing type and zone
-            channel_info = await self.bot.db_manager.execute_query(
-                "SELECT channel_id, message_id FROM marketplace_channels WHERE guild_id = $1 AND listing_type = $2 AND zone = $3",
-                interaction.guild.id, self.listing_data['listing_type'], self.listing_data['zone']
-            )
-
-            if channel_info:
-                channel_data = channel_info[0]
-                channel = interaction.guild.get_channel(channel_data['channel_id'])
-
-                if channel:
-                    # Get updated listings with queue data
-                    view = MarketplaceView(self.bot, self.listing_data['listing_type'], self.listing_data['zone'], 0)
-                    listings = await view.get_listings_with_queues(interaction.guild.id)
-
-                    # Create updated embed
-                    from bot.ui.embeds import MarketplaceEmbeds
-                    embeds = MarketplaceEmbeds()
-                    embed = embeds.create_marketplace_embed(
-                        self.listing_data['listing_type'], self.listing_data['zone'], listings, 0
-                    )
-
-                    # Create new view
-                    new_view = MarketplaceView(self.bot, self.listing_data['listing_type'], self.listing_data['zone'], 0)
-
-                    # Update the message
-                    message_id = channel_data.get('message_id')
-                    if message_id:
-                        try:
-                            message = await channel.fetch_message(message_id)
-                            await message.edit(embed=embed, view=new_view)
-                            logger.info(f"Successfully refreshed marketplace embed with {len(listings)} listings")
-                        except discord.NotFound:
-                            logger.warning(f"Message {message_id} not found, searching for message...")
-                            # If message not found by ID, search for it
-                            async for msg in channel.history(limit=50):
-                                if (msg.author == self.bot.user and 
-                                    msg.embeds and 
-                                    msg.embeds[0].title and 
-                                    self.listing_data['listing_type'].upper() in msg.embeds[0].title and
-                                    self.listing_data['zone'].lower() in msg.embeds[0].title.lower()):
-                                    await msg.edit(embed=embed, view=new_view)
-                                    # Update stored message ID
-                                    await self.bot.db_manager.execute_command(
-                                        "UPDATE marketplace_channels SET message_id = $1 WHERE channel_id = $2",
-                                        msg.id, channel.id
-                                    )
-                                    logger.info(f"Found and updated marketplace message, new ID: {msg.id}")
-                                    break
-                    else:
-                        logger.warning(f"No message_id stored for channel {channel.id}, searching...")
-                        # No stored message ID, search for the message
-                        async for msg in channel.history(limit=50):
-                            if (msg.author == self.bot.user and 
-                                msg.embeds and 
-                                msg.embeds[0].title and 
-                                self.listing_data['listing_type'].upper() in msg.embeds[0].title and
-                                self.listing_data['zone'].lower() in msg.embeds[0].title.lower()):
-                                await msg.edit(embed=embed, view=new_view)
-                                # Store the message ID for future use
-                                await self.bot.db_manager.execute_command(
-                                    "UPDATE marketplace_channels SET message_id = $1 WHERE channel_id = $2",
-                                    msg.id, channel.id
-                                )
-                                logger.info(f"Found and updated marketplace message, stored ID: {msg.id}")
-                                break
-                else:
-                    logger.warning(f"Channel {channel_data['channel_id']} not found")
-            else:
-                logger.warning(f"No channel info found for {self.listing_data['listing_type']} in {self.listing_data['zone']}")
-
-        except Exception as e:
-            logger.error(f"Error refreshing marketplace embed: {e}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
\ No newline at end of file
+        await self.bot.marketplace_service.refresh_zone_embed(interaction.guild, self.listing_data['listing_type'], self.listing_data['zone'])
@@ -8,6 +8,7 @@ import logging
 from bot.ui.modals import ListingModal, QuantityNotesModal
 from bot.ui.embeds import MarketplaceEmbeds
 import asyncio
+from itertools import islice
 import traceback
 
 logger = logging.getLogger(__name__)
@@ -285,25 +286,13 @@ class MarketplaceView(discord.ui.View):
             except:
                 pass
 
-    async def get_listings_with_queues(self, guild_id: int):
-        """Get listings with their queue data."""
-        listings = await self.bot.db_manager.get_zone_listings(
-            guild_id, self.listing_type, self.zone
-        )
-
-        # Add queue data to each listing
-        for listing in listings:
-            if self.listing_type.upper() == "WTS":
-                queues = await self.bot.db_manager.get_listing_queues(listing['id'])
-                listing['queues'] = queues
-
-        return listings
-
     async def update_embed(self, interaction: discord.Interaction):
         """Update the marketplace embed with current page."""
         try:
             # Get current listings with queue data
-            listings = await self.get_listings_with_queues(interaction.guild.id)
+            listings = await self.bot.marketplace_service.get_zone_listings_with_queues(
+                interaction.guild.id, self.listing_type, self.zone
+            )
 
             # Create updated embed
             embed = self.embeds.create_marketplace_embed(
@@ -377,7 +366,7 @@ class MarketplaceView(discord.ui.View):
             embed = discord.Embed(
                 title=f"🗑️ Remove {self.listing_type} Listings",
                 description="Select which listing you want to remove:",
-                color=self.embeds.COLORS['warning']
+                color=self.embeds.WARNING_COLOR
             )
 
             await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
@@ -402,64 +391,7 @@ class MarketplaceView(discord.ui.View):
 
     async def refresh_marketplace_embed(self, interaction: discord.Interaction):
         """Refresh the marketplace embed in the channel."""
-        try:
-            # Get the specific marketplace channel for this listing type and zone
-            channel_info = await self.bot.db_manager.execute_query(
-                "SELECT channel_id, message_id FROM marketplace_channels WHERE guild_id = $1 AND listing_type = $2 AND zone = $3",
-                interaction.guild.id, self.listing_type, self.zone
-            )
-
-            if not channel_info:
-                logger.warning(f"No marketplace channel found for {self.listing_type} in {self.zone}")
-                return
-
-            channel_data = channel_info[0]
-            channel = interaction.guild.get_channel(channel_data['channel_id'])
-
-            if not channel:
-                logger.warning(f"Channel {channel_data['channel_id']} not found")
-                return
-
-            # Get updated listings with queue data
-            listings = await self.get_listings_with_queues(interaction.guild.id)
-
-            # Create updated embed
-            embeds = MarketplaceEmbeds()
-            embed = embeds.create_marketplace_embed(
-                self.listing_type, self.zone, listings, 0  # Reset to first page
-            )
-
-            # Create new view
-            view = MarketplaceView(self.bot, self.listing_type, self.zone, 0)
-
-            # Try to find and update the marketplace message
-            message_id = channel_data.get('message_id')
-            if message_id:
-                try:
-                    message = await channel.fetch_message(message_id)
-                    await message.edit(embed=embed, view=view)
-                    return
-                except discord.NotFound:
-                    logger.warning(f"Marketplace message {message_id} not found")
-
-            # If message_id doesn't work, search for the message
-            async for message in channel.history(limit=50):
-                if (message.author == self.bot.user and 
-                    message.embeds and 
-                    message.embeds[0].title and 
-                    self.listing_type.upper() in message.embeds[0].title and
-                    self.zone.lower() in message.embeds[0].title.lower()):
-                    await message.edit(embed=embed, view=view)
-
-                    # Update the stored message_id
-                    await self.bot.db_manager.execute_command(
-                        "UPDATE marketplace_channels SET message_id = $1 WHERE channel_id = $2",
-                        message.id, channel.id
-                    )
-                    break
-
-        except Exception as e:
-            logger.error(f"Error refreshing marketplace embed: {e}")
+        await self.bot.marketplace_service.refresh_zone_embed(interaction.guild, self.listing_type, self.zone)
 
 class MonsterSelectView(discord.ui.View):
     """View for selecting monster/source."""
@@ -473,7 +405,7 @@ class MonsterSelectView(discord.ui.View):
         # Create dropdown with monsters
         options = [
             discord.SelectOption(label=monster, value=monster)
-            for monster in monsters[:25]  # Discord limit
+            for monster in islice(monsters, 25)  # Discord limit
         ]
 
         self.monster_select.options = options
@@ -524,7 +456,7 @@ class ItemSelectView(discord.ui.View):
         # Create dropdown with items
         options = [
             discord.SelectOption(label=item, value=item)
-            for item in items[:25]  # Discord limit of 25 options
+            for item in islice(items, 25)  # Discord limit of 25 options
         ]
 
         self.item_select.options = options
@@ -586,7 +518,7 @@ class RemoveListingView(discord.ui.View):
 
         # Create dropdown with user's listings
         options = []
-        for listing in listings[:25]:  # Discord limit
+        for listing in islice(listings, 25):  # Discord limit
             label = f"{listing['item']} - {listing['subcategory']}"
             if len(label) > 100:
                 label = label[:97] + "..."
@@ -641,62 +573,4 @@ class RemoveListingView(discord.ui.View):
 
     async def refresh_marketplace_embed(self, interaction: discord.Interaction):
         """Refresh the marketplace embed in the channel."""
-        try:
-            # Get the specific marketplace channel for this listing type and zone
-            channel_info = await self.bot.db_manager.execute_query(
-                "SELECT channel_id, message_id FROM marketplace_channels WHERE guild_id = $1 AND listing_type = $2 AND zone = $3",
-                interaction.guild.id, self.listing_type, self.zone
-            )
-
-            if not channel_info:
-                logger.warning(f"No marketplace channel found for {self.listing_type} in {self.zone}")
-                return
-
-            channel_data = channel_info[0]
-            channel = interaction.guild.get_channel(channel_data['channel_id'])
-
-            if not channel:
-                logger.warning(f"Channel {channel_data['channel_id']} not found")
-                return
-
-            # Get updated listings
-            view = MarketplaceView(self.bot, self.listing_type, self.zone, 0)
-            listings = await view.get_listings_with_queues(interaction.guild.id)
-
-            # Create updated embed
-            embeds = MarketplaceEmbeds()
-            embed = embeds.create_marketplace_embed(
-                self.listing_type, self.zone, listings, 0  # Reset to first page
-            )
-
-            # Create new view
-            new_view = MarketplaceView(self.bot, self.listing_type, self.zone, 0)
-
-            # Try to find and update the marketplace message
-            message_id = channel_data.get('message_id')
-            if message_id:
-                try:
-                    message = await channel.fetch_message(message_id)
-                    await message.edit(embed=embed, view=new_view)
-                    return
-                except discord.NotFound:
-                    logger.warning(f"Marketplace message {message_id} not found")
-
-            # If message_id doesn't work, search for the message
-            async for message in channel.history(limit=50):
-                if (message.author == self.bot.user and 
-                    message.embeds and 
-                    message.embeds[0].title and 
-                    self.listing_type.upper() in message.embeds[0].title and
-                    self.zone.lower() in message.embeds[0].title.lower()):
-                    await message.edit(embed=embed, view=new_view)
-
-                    # Update the stored message_id
-                    await self.bot.db_manager.execute_command(
-                        "UPDATE marketplace_channels SET message_id = $1 WHERE channel_id = $2",
-                        message.id, channel.id
-                    )
-                    break
-
-        except Exception as e:
-            logger.error(f"Error refreshing marketplace embed: {e}")
\ No newline at end of file
+        await self.bot.marketplace_service.refresh_zone_embed(interaction.guild, self.listing_type, self.zone)
@@ -3,7 +3,6 @@ from discord.ext import commands
 import logging
 from datetime import datetime, timezone
 from typing import Optional
-import asyncio
 import traceback
 import os
 from dotenv import load_dotenv
@@ -447,7 +446,7 @@ class EventConfirmationView(discord.ui.View):
             if seller_confirmed and buyer_confirmed:
                 logger.info(f"Both parties confirmed for event {self.event_id}, scheduling rating prompt")
                 scheduler_service = self.bot.scheduler_service
-                asyncio.create_task(scheduler_service.schedule_rating_prompt(self.event_id, int(os.getenv("rating_delay_seconds", 3600))))
+                await scheduler_service.schedule_rating_prompt(self.event_id, int(os.getenv("rating_delay_seconds", 3600)))
 
         except Exception as e:
             logger.error(f"Error checking rating prompt schedule: {e}")
@@ -106,9 +106,10 @@ EMBED_COLOR_WTS = int(os.getenv("EMBED_COLOR_WTS", "0xF59E0B"), 16)
 EMBED_COLOR_WTB = int(os.getenv("EMBED_COLOR_WTB", "0x3B82F6"), 16)
 
 # Performance configuration
-DATABASE_POOL_MIN_SIZE = int(os.getenv("DATABASE_POOL_MIN_SIZE", "1"))
-DATABASE_POOL_MAX_SIZE = int(os.getenv("DATABASE_POOL_MAX_SIZE", "10"))
+DATABASE_POOL_MIN_SIZE = int(os.getenv("DATABASE_POOL_MIN_SIZE", "5"))
+DATABASE_POOL_MAX_SIZE = int(os.getenv("DATABASE_POOL_MAX_SIZE", "20"))
 DATABASE_COMMAND_TIMEOUT = int(os.getenv("DATABASE_COMMAND_TIMEOUT", "60"))
+DATABASE_STATEMENT_CACHE_SIZE = int(os.getenv("DATABASE_STATEMENT_CACHE_SIZE", "256"))
 
 # Cache configuration
 ENABLE_CACHING = os.getenv("ENABLE_CACHING", "true").lower() == "true"
@@ -174,7 +175,8 @@ class Config:
             "url": DATABASE_URL,
             "min_size": DATABASE_POOL_MIN_SIZE,
             "max_size": DATABASE_POOL_MAX_SIZE,
-            "command_timeout": DATABASE_COMMAND_TIMEOUT
+            "command_timeout": DATABASE_COMMAND_TIMEOUT,
+            "statement_cache_size": DATABASE_STATEMENT_CACHE_SIZE
         }
     
     @property
@@ -288,7 +290,8 @@ def validate_configuration() -> bool:
             ("LISTING_EXPIRY_DAYS", LISTING_EXPIRY_DAYS),
             ("MAX_LISTINGS_PER_USER", MAX_LISTINGS_PER_USER),
             ("DATABASE_POOL_MIN_SIZE", DATABASE_POOL_MIN_SIZE),
-            ("DATABASE_POOL_MAX_SIZE", DATABASE_POOL_MAX_SIZE)
+            ("DATABASE_POOL_MAX_SIZE", DATABASE_POOL_MAX_SIZE),
+            ("DATABASE_STATEMENT_CACHE_SIZE", DATABASE_STATEMENT_CACHE_SIZE)
         ]
         
         for setting_name, value in numeric_settings: